@@ -1,17 +1,355 @@
-from fastapi import FastAPI, status
-from pydantic import BaseModel
+from fastapi import FastAPI, status, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+from datetime import date
+import hashlib
+from functools import lru_cache
+import json
+from mail_send import add_subscriber, valid_email
+from main import main, analyze_url, save_results_to_pdf
+from utils.singleflight import SingleFlight
+from utils.metrics import METRICS
+from utils.results_store import ResultsStore
+from utils.search_index import SearchIndex
+from utils.near_duplicates import NearDuplicateIndex
+from utils.report_artifacts import KINDS, ReportArtifacts
+from scripts.jobs import API_MAX_PRIORITY, JobQueue, api_payload, dedupe_key_for
+from scripts.sources import SOURCES, is_source_url
 
 app = FastAPI()
 
+# Identical concurrent requests share one scrape+Gemini job; results are reused for an hour
+analysis_jobs = SingleFlight(ttl_seconds=3600)
+pdf_jobs = SingleFlight(ttl_seconds=3600)
+
+
+# The stores are opened on first use, so importing the app (e.g. for --help) creates no files
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    # Long-running work goes to `python -m scripts.jobs worker`; the API only enqueues and polls
+    return JobQueue()
+
+
+@lru_cache(maxsize=None)
+def get_results_store() -> ResultsStore:
+    # Every analysis served by the API is kept for the /results queries
+    return ResultsStore()
+
+
+@lru_cache(maxsize=None)
+def get_search_index() -> SearchIndex:
+    return SearchIndex(get_results_store())
+
+
+@lru_cache(maxsize=None)
+def get_near_duplicates() -> NearDuplicateIndex:
+    return NearDuplicateIndex(get_results_store())
+
+
+@lru_cache(maxsize=None)
+def get_report_artifacts() -> ReportArtifacts:
+    # Daily reports published by the report job / mail_send; served as files, never recomputed
+    return ReportArtifacts()
+
+
+DATED_REPORT_CACHE = "public, max-age=86400"
+LATEST_REPORT_CACHE = "public, no-cache"  # revalidated with the ETag, so a new day shows up at once
+
 class LeadCapture(BaseModel):
     email : str
 
+    @field_validator("email")
+    @classmethod
+    def single_address(cls, email: str) -> str:
+        email = email.strip()
+        if not valid_email(email):
+            raise ValueError("must be a single email address")
+        return email
+
+
+class JobRequest(BaseModel):
+    kind: str
+    payload: dict = {}
+    priority: int = Field(0, ge=0, le=API_MAX_PRIORITY)
+
+
+class JobStatus(BaseModel):
+    """What GET /jobs/{id} shows: progress and outcome, without worker names or file paths"""
+    id: int
+    kind: str
+    state: str
+    progress: float
+    message: str | None = None
+    error: str | None = None
+    attempts: int
+    max_attempts: int
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    report_date: str | None = None
+
+
+def today_key(num_articles: int) -> str:
+    return f"today:{date.today().isoformat()}:{num_articles}"
+
+
+async def today_results(num_articles: int):
+    key = today_key(num_articles)
+    results = await analysis_jobs.run(key, main, num_articles, store=get_results_store(),
+                                      duplicates=get_near_duplicates())
+    if not results:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Analysis failed")
+    return key, results
+
+
+def check_article_url(url: str):
+    # The server fetches this URL, so only the newspapers' own https pages are allowed
+    if not is_source_url(url):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"url must be an https article on one of: {', '.join(s.domain for s in SOURCES.values())}")
+
+
+async def article_results(url: str):
+    check_article_url(url)
+    key = f"article:{url}"
+    results = await analysis_jobs.run(key, analyze_url, url, store=get_results_store(),
+                                      duplicates=get_near_duplicates())
+    if not results:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Analysis failed")
+    return key, results
+
+
+async def render_pdf(key: str, results):
+    filename = f"api_{hashlib.sha256(key.encode()).hexdigest()[:16]}.pdf"
+    path = await pdf_jobs.run(key, save_results_to_pdf, results, filename)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="PDF generation failed")
+    return FileResponse(path, media_type="application/pdf", filename="editorial_analysis.pdf")
+
+
+async def ndjson_events(key: str, run):
+    """
+    Stream the analysis job for `key` as NDJSON lines. Every client follows the same single-flight
+    job as the plain JSON routes: `run(emit)` only runs when no job for `key` is in flight, and a
+    cached result is replayed instead of being analyzed again.
+    """
+    events, job = analysis_jobs.subscribe(key, run, replay_results)
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    finally:
+        analysis_jobs.unsubscribe(key, events)
+
+    # A cancelled job has no exception to ask for: job.exception() would raise CancelledError
+    results = None if job.cancelled() or job.exception() else job.result()
+    if results:
+        yield json.dumps({"type": "done", "session_info": results["session_info"]}, ensure_ascii=False) + "\n"
+    else:
+        yield json.dumps({"type": "error", "detail": "Analysis failed"}) + "\n"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def published_report(day: str):
+    entry = get_report_artifacts().get(day)
+    if not entry:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No report published for this date")
+    return entry
+
+
+def stream_callbacks(emit):
+    """on_field/on_article callbacks that forward streamed fields and finished articles to `emit`"""
+    def on_field(number, event):
+        emit({**event, "article": number})
+
+    def on_article(entry):
+        info = entry["article_info"]
+        emit({"type": "article", "article": info["number"], "title": info["title"], "url": info["url"],
+              "status": info["status"]})
+
+    return on_field, on_article
+
+
+def replay_results(results, emit):
+    """Emit finished results as the events a live analysis would have streamed"""
+    from scripts.gemini import replay_fields
+
+    on_field, on_article = stream_callbacks(emit)
+    for entry in results["articles_analysis"]:
+        number = entry["article_info"]["number"]
+        if entry["gemini_analysis"]:
+            replay_fields(entry["gemini_analysis"], lambda event: on_field(number, event))
+        on_article(entry)
+
 
 @app.post("/download_mail/")
 def capture_mail(mail:LeadCapture):
+    # Subscribers receive the shared daily report from mail_send.send_bulk
+    add_subscriber(mail.email)
     return mail
 
 
+@app.get("/analysis/today")
+async def analysis_today(num_articles: int = Query(2, ge=1, le=5)):
+    _, results = await today_results(num_articles)
+    return results
+
+
+@app.get("/analysis/today/pdf")
+async def analysis_today_pdf(num_articles: int = Query(2, ge=1, le=5)):
+    key, results = await today_results(num_articles)
+    return await render_pdf(key, results)
+
+
+@app.get("/analysis/today/stream")
+async def analysis_today_stream(num_articles: int = Query(2, ge=1, le=5)):
+    def run(emit):
+        on_field, on_article = stream_callbacks(emit)
+        return main(num_articles, on_field=on_field, on_article=on_article, store=get_results_store(),
+                    duplicates=get_near_duplicates())
+
+    return StreamingResponse(ndjson_events(today_key(num_articles), run), media_type="application/x-ndjson")
+
+
+@app.get("/analysis/article")
+async def analysis_article(url: str):
+    _, results = await article_results(url)
+    return results
+
+
+@app.get("/analysis/article/pdf")
+async def analysis_article_pdf(url: str):
+    key, results = await article_results(url)
+    return await render_pdf(key, results)
+
+
+@app.get("/analysis/article/stream")
+async def analysis_article_stream(url: str):
+    check_article_url(url)
+    def run(emit):
+        on_field, on_article = stream_callbacks(emit)
+        results = analyze_url(url, on_field=on_field, store=get_results_store(),
+                              duplicates=get_near_duplicates())
+        if results:
+            on_article(results["articles_analysis"][0])
+        return results
+
+    return StreamingResponse(ndjson_events(f"article:{url}", run), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+def enqueue_job(request: JobRequest):
+    # Only kinds with harmless inputs; the payload is rebuilt from validated fields
+    try:
+        payload = api_payload(request.kind, request.payload)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    job_queue = get_job_queue()
+    job_id = job_queue.enqueue(request.kind, payload, request.priority, dedupe_key_for(request.kind, payload))
+    job = job_queue.get(job_id)
+    return {"job_id": job_id, "state": job["state"]}
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+def job_status(job_id: int):
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    # A published report is downloadable from /reports/{report_date}/pdf
+    return JobStatus(**job, report_date=(job["result"] or {}).get("report_date"))
+
+
+@app.get("/results/articles")
+def stored_articles(tone: str = None, start: date = None, end: date = None, q: str = None,
+                    limit: int = Query(100, ge=1, le=1000)):
+    # e.g. /results/articles?tone=critical&start=2025-03-01&end=2025-03-31
+    if q:
+        return get_results_store().search(q, limit=limit)
+    return get_results_store().articles(tone=tone, start=start and start.isoformat(), end=end and end.isoformat(),
+                                  limit=limit)
+
+
+@app.get("/results/vocabulary")
+def stored_vocabulary(min_count: int = Query(3, ge=1), limit: int = Query(100, ge=1, le=1000)):
+    return get_results_store().frequent_words(min_count, limit=limit)
+
+
+@app.get("/results/vocabulary/{word}")
+def stored_word(word: str):
+    usages = get_results_store().word_usages(word)
+    if not usages:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+    return usages
+
+
+@app.get("/search")
+def search(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=100)):
+    # BM25 over titles, article text and vocabulary words; newly stored analyses are indexed on the next query
+    return {"query": q, "results": get_search_index().search(q, limit=limit)}
+
+
+@app.get("/reports")
+def reports(request: Request):
+    etag = get_report_artifacts().manifest_etag()
+    headers = {"ETag": etag, "Cache-Control": LATEST_REPORT_CACHE}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    dates = get_report_artifacts().dates()
+    return JSONResponse({"dates": dates, "latest": dates[0] if dates else None}, headers=headers)
+
+
+@app.get("/reports/{day}")
+def report_preview(day: str, request: Request):
+    # Landing-page preview: titles and tones from the manifest, e.g. /reports/latest
+    entry = published_report(day)
+    etag = f'"{entry["json"]["sha256"][:32]}{entry["pdf"]["sha256"][:32]}"'
+    headers = {"ETag": etag, "Cache-Control": LATEST_REPORT_CACHE if day == "latest" else DATED_REPORT_CACHE}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(entry, headers=headers)
+
+
+@app.api_route("/reports/{day}/{kind}", methods=["GET", "HEAD"])
+def report_file(day: str, kind: str, request: Request):
+    # Range requests and If-Range are handled by FileResponse, which also hands the file to the
+    # server (http.response.pathsend) instead of streaming it through Python when supported
+    if kind not in KINDS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown report format")
+
+    entry = published_report(day)
+    etag = f'"{entry[kind]["sha256"]}"'
+    headers = {"ETag": etag, "Cache-Control": LATEST_REPORT_CACHE if day == "latest" else DATED_REPORT_CACHE}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    artifacts = get_report_artifacts()
+    return FileResponse(
+        artifacts.object_path(entry, kind),
+        media_type=KINDS[kind],
+        headers=headers,
+        filename=f"editorial_analysis_{entry['date']}.{kind}",
+        content_disposition_type="attachment" if kind == "pdf" else "inline",
+        stat_result=artifacts.object_stat(entry, kind)
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus scrape target; PDFs rendered in pool workers are counted in those processes
+    return PlainTextResponse(METRICS.prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health_Chk():
     return {
@@ -0,0 +1,157 @@
+import json
+import time
+import threading
+import http.server
+from types import SimpleNamespace
+
+from scripts.report import sample_results
+
+# Rough size of The Hindu's page chrome (navigation, scripts, footer) around the article body
+CHROME_LINKS = 400
+CHROME_SCRIPTS = 30
+
+PARAGRAPH = ("The government's decision to revisit the policy framework reflects a growing recognition that "
+             "incremental reform, however well-intentioned, has not kept pace with the structural shifts in "
+             "the economy. Critics argue that the absence of consultation undermines legitimacy, while "
+             "supporters point to the urgency of the moment and the cost of further delay. ")
+
+
+def page_chrome() -> tuple:
+    """Header and footer markup shared by index and article pages"""
+    nav = "".join(f'<li><a href="/news/section-{i}/">Section {i}</a></li>' for i in range(CHROME_LINKS))
+    scripts = "".join(f"<script>window.__cfg{i} = {{'slot': {i}, 'lazy': true}};</script>" for i in range(CHROME_SCRIPTS))
+    header = f"<html><head><title>The Hindu</title>{scripts}</head><body><header><nav><ul>{nav}</ul></nav></header>"
+    footer = f"<footer><ul>{nav}</ul></footer></body></html>"
+    return header, footer
+
+
+def index_html(base_url: str, num_links: int) -> str:
+    """Editorial index page with `num_links` teaser links (plus non-editorial noise)"""
+    header, footer = page_chrome()
+    teasers = "".join(
+        f'<div class="element"><h3 class="title"><a href="{base_url}/opinion/editorial/editorial-{i}/article{i}.ece">'
+        f'<strong>Editorial {i}</strong></a></h3>'
+        f'<a href="{base_url}/opinion/lead/lead-{i}/article{i}.ece">Lead {i}</a></div>'
+        for i in range(1, num_links + 1)
+    )
+    return f"{header}<main>{teasers}</main>{footer}"
+
+
+def article_html(number: int, paragraphs: int = 12) -> str:
+    """Article page shaped like The Hindu's markup, including the sections the scraper filters out"""
+    header, footer = page_chrome()
+    # Paragraphs must differ, or strip_boilerplate drops the repeats before analysis
+    body = "".join(f"<p>{PARAGRAPH}(Paragraph {i} of editorial {number}.)</p>" for i in range(1, paragraphs + 1))
+    related = "".join(f'<p><a href="/topic/{i}/">Topic {i}</a> / <a href="/t/{i}/">Tag</a> / x / y</p>' for i in range(5))
+    return (
+        f'{header}<meta property="og:title" content="Editorial {number}">'
+        f'<h1 class="title"> Editorial {number} </h1>'
+        f'<div class="articlebodycontent" id="content-body-{number}">{body}'
+        f'<div class="related-topics">{related}</div></div>{footer}'
+    )
+
+
+def archive_html(numbers) -> str:
+    """Archive day page linking (absolutely, as thehindu.com does) to the editorials `numbers`"""
+    header, footer = page_chrome()
+    links = "".join(
+        f'<li><a href="https://www.thehindu.com/opinion/editorial/editorial-{i}/article{i}.ece">Editorial {i}</a></li>'
+        for i in numbers
+    )
+    return f"{header}<main><ul class='archive-list'>{links}</ul></main>{footer}"
+
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+
+        path = self.path.split("?")[0]
+        number = None
+        if path.endswith(".ece") and "/article" in path:
+            number = int(path.rsplit("/article", 1)[1][:-len(".ece")])
+        day = path.removeprefix("/archive/web/").strip("/") if path.startswith("/archive/web/") else None
+
+        if path == "/opinion/editorial/":
+            body = server.index
+        elif day in server.archive:
+            body = archive_html(server.archive[day])
+        elif number is not None and number not in server.missing:
+            body = server.article(number)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer:
+    """Local HTTP server serving a synthetic editorial index and its articles"""
+
+    def __init__(self, num_links: int = 500, paragraphs: int = 12, latency: float = 0.0, archive: dict = None):
+        """
+        Args:
+            num_links: Editorial links on the index page
+            paragraphs: Paragraphs per article
+            latency: Seconds each response is delayed by
+            archive: Archive day ("YYYY/MM/DD") -> editorial numbers listed on that day's page
+        """
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.editorial_url = f"{self.base_url}/opinion/editorial/"
+        self.archive_url = f"{self.base_url}/archive/web/{{year}}/{{month:02d}}/{{day:02d}}/"
+        # Editorial numbers answered with a 404; may be changed while the server runs
+        self.missing = set()
+
+        articles = {}
+
+        def article(number):
+            if number not in articles:
+                articles[number] = article_html(number, paragraphs)
+            return articles[number]
+
+        self.httpd.latency = latency
+        self.httpd.index = index_html(self.base_url, num_links)
+        self.httpd.article = article
+        self.httpd.archive = archive or {}
+        self.httpd.missing = self.missing
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def canned_analysis() -> dict:
+    """A valid EditorialAnalysis payload"""
+    return sample_results(num_articles=1)["articles_analysis"][0]["gemini_analysis"]
+
+
+class FakeGeminiClient:
+    """Stand-in for genai.Client returning canned EditorialAnalysis JSON after a fixed latency"""
+
+    def __init__(self, latency: float = 0.0, prompt_tokens: int = 1500, output_tokens: int = 1200):
+        self.latency = latency
+        self.text = json.dumps(canned_analysis())
+        self.usage = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens)
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(text=self.text, usage_metadata=self.usage)
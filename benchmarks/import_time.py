@@ -0,0 +1,74 @@
+"""
+Import-time budget check for the entry points, measured with `python -X importtime`.
+
+    python -m benchmarks.import_time            # exit 1 if a budget is exceeded
+    python -m benchmarks.import_time --top 15   # also list the slowest imports
+"""
+import sys
+import time
+import argparse
+import subprocess
+
+# Cumulative import time budgets in milliseconds. api.routes is dominated by FastAPI itself (~350ms).
+BUDGETS = {
+    "cli": 50,
+    "main": 100,
+    "mail_send": 150,
+    "scripts.jobs": 100,
+    "api.routes": 700,
+}
+
+# Wall-clock budget for `python cli.py --help`, interpreter startup included
+HELP_BUDGET_MS = 300
+
+
+def import_times(module: str) -> list:
+    """[(cumulative_ms, self_ms, name)] for `module` and everything imported beneath it"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Children are listed (indented) before their parent; a new top-level import starts a new tree
+        if name.strip() != module and not name.startswith("   "):
+            times = []
+            continue
+        times.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.strip()))
+        if name.strip() == module:
+            return times
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def help_time_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "cli.py", "--help"], capture_output=True, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check entry-point import times against their budgets")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports per entry point")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module, budget in BUDGETS.items():
+        times = import_times(module)
+        total = next(cumulative for cumulative, _, name in times if name == module)
+        status = "✅" if total <= budget else "❌"
+        print(f"{status} import {module:<14} {total:8.1f} ms  (budget {budget} ms)")
+        if total > budget:
+            over_budget.append(module)
+
+        for cumulative, self_ms, name in sorted(times, reverse=True)[:args.top]:
+            print(f"      {cumulative:8.1f} ms  {self_ms:7.1f} ms self  {name}")
+
+    elapsed = help_time_ms()
+    status = "✅" if elapsed <= HELP_BUDGET_MS else "❌"
+    print(f"{status} cli.py --help        {elapsed:8.1f} ms  (budget {HELP_BUDGET_MS} ms)")
+    if elapsed > HELP_BUDGET_MS:
+        over_budget.append("cli --help")
+
+    if over_budget:
+        sys.exit(1)
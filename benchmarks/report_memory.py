@@ -0,0 +1,83 @@
+"""
+Peak memory of PDF report rendering versus article count, each size rendered in a fresh process.
+
+    python -m benchmarks.report_memory                       # default sizes 10,100,500
+    python -m benchmarks.report_memory --sizes 50,1000 --eager
+    python -m benchmarks.report_memory --budget-mb 60        # exit 1 if a streaming render exceeds it
+
+RSS is reported as the growth of the process high-water mark during the render, so the memory
+held by the (synthetic) analysis results themselves is excluded.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+# Runs in the child: build the results, then render them and report the high-water marks (KiB on Linux)
+CHILD = """
+import os, sys, json, time, resource
+from scripts.report import get_report_template, sample_results
+
+size, streaming, path = int(sys.argv[1]), sys.argv[2] == "1", sys.argv[3]
+results = sample_results(size, paragraphs=20)
+template = get_report_template()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+template.render(results, path, streaming=streaming)
+print(json.dumps({
+    "before_kb": before,
+    "peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "seconds": time.perf_counter() - started,
+    "bytes": os.path.getsize(path),
+}))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(size: int, streaming: bool, out_dir: str) -> dict:
+    """Render `size` articles in a child process and return its memory and timing figures"""
+    path = os.path.join(out_dir, f"report_{size}_{int(streaming)}.pdf")
+    completed = subprocess.run([sys.executable, "-c", CHILD, str(size), str(int(streaming)), path],
+                               capture_output=True, text=True, check=True, cwd=ROOT)
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    sample["render_mb"] = (sample["peak_kb"] - sample["before_kb"]) / 1024
+    return sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of PDF report rendering versus article count")
+    parser.add_argument("--sizes", default="10,100,500", help="Comma-separated article counts")
+    parser.add_argument("--eager", action="store_true", help="Also measure the expand-everything-up-front build")
+    parser.add_argument("--budget-mb", type=float, default=None, help="Fail if a streaming render grows RSS by more")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    modes = [("streaming", True)] + ([("eager", False)] if args.eager else [])
+    out_dir = tempfile.mkdtemp()
+    results = []
+    over_budget = False
+
+    print(f"{'articles':>8}  {'mode':<10} {'render RSS':>11} {'peak RSS':>9} {'time':>8} {'PDF':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for mode, streaming in modes:
+            sample = measure(size, streaming, out_dir)
+            results.append({"articles": size, "mode": mode, **sample})
+            print(f"{size:>8}  {mode:<10} {sample['render_mb']:>8.1f} MB {sample['peak_kb'] / 1024:>6.1f} MB "
+                  f"{sample['seconds']:>7.2f}s {sample['bytes'] / 1024:>6.0f} KB")
+
+            if streaming and args.budget_mb is not None and sample["render_mb"] > args.budget_mb:
+                print(f"❌ {size} articles grew RSS by {sample['render_mb']:.1f} MB (budget {args.budget_mb} MB)")
+                over_budget = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
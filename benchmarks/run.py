@@ -0,0 +1,180 @@
+"""
+Offline benchmarks for the scraper, analyzer and report renderer.
+
+Everything runs against a local fixture server and a fake Gemini client, so no network
+access or API key is needed:
+
+    python -m benchmarks.run                          # default sizes 1,10,100,500
+    python -m benchmarks.run --sizes 1,10 --json out.json
+    python -m benchmarks.run --compare out.json       # exit 1 on a regression
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tempfile
+import contextlib
+
+from benchmarks.fixtures import FixtureServer, FakeGeminiClient, PARAGRAPH
+from scripts.scrapper import Scrapper
+from scripts.gemini import Gemini
+from scripts.report import sample_results
+from main import main, save_results_to_pdf
+from utils.results_store import ResultsStore
+from utils.search_index import SearchIndex
+
+# Editorials indexed per benchmark size, so the search benchmark covers corpora of tens of thousands
+SEARCH_DOCS_PER_SIZE = 50
+PARAGRAPH_WORDS = PARAGRAPH.split()
+
+
+def measure(fn, repeat: int) -> dict:
+    """Run `fn` `repeat` times (after one warm-up) and summarize the wall-clock times"""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return {"median": statistics.median(timings), "min": min(timings), "max": max(timings)}
+
+
+def bench_editorial_links(server, size: int, repeat: int) -> dict:
+    scraper = Scrapper(server.editorial_url)
+
+    def run():
+        scraper._soups = {}
+        links = scraper.get_editorial_links(num_articles=size)
+        assert len(links) == size
+
+    return measure(run, repeat)
+
+
+def bench_article_content(server, size: int, repeat: int) -> dict:
+    scrapers = [Scrapper(f"{server.base_url}/opinion/editorial/editorial-{i}/article{i}.ece")
+                for i in range(1, size + 1)]
+
+    def run():
+        for scraper in scrapers:
+            scraper._soups = {}
+            assert scraper.get_article_content()
+
+    return measure(run, repeat)
+
+
+def bench_main(server, size: int, repeat: int, gemini_latency: float) -> dict:
+    gemini = Gemini(client=FakeGeminiClient(latency=gemini_latency))
+
+    def run():
+        results = main(size, requests_per_minute=0, requests_per_second=0, use_cache=False,
+                       editorial_url=server.editorial_url, gemini=gemini)
+        assert results["session_info"]["total_articles"] == size
+
+    return measure(run, repeat)
+
+
+def bench_pdf(size: int, repeat: int) -> dict:
+    results = sample_results(num_articles=size)
+    filename = f"benchmark_{os.getpid()}.pdf"
+
+    def run():
+        assert save_results_to_pdf(results, filename)
+
+    try:
+        return measure(run, repeat)
+    finally:
+        if os.path.exists(os.path.join("logs", filename)):
+            os.remove(os.path.join("logs", filename))
+
+
+def bench_search(size: int, repeat: int) -> dict:
+    num_docs = size * SEARCH_DOCS_PER_SIZE
+    analysis = sample_results(num_articles=1)["articles_analysis"][0]["gemini_analysis"]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore(os.path.join(tmp, "results.sqlite"))
+        store.save_articles(
+            {
+                "url": f"https://example.com/editorial-{i}",
+                "title": f"Editorial {i}",
+                "published_on": "2025-03-01",
+                "status": "success",
+                # Vary the text so postings lists have realistic, uneven lengths
+                "content": f"{PARAGRAPH_WORDS[i % len(PARAGRAPH_WORDS)]} editorial {i} " * 20 + PARAGRAPH,
+                "analysis": analysis
+            }
+            for i in range(num_docs)
+        )
+        index = SearchIndex(store, path=os.path.join(tmp, "search"))
+        index.sync(flush=True)
+
+        def run():
+            assert index.search("incremental reform legitimacy", limit=10)
+
+        return measure(run, repeat)
+
+
+def run_benchmarks(sizes, repeat: int = 3, gemini_latency: float = 0.05, http_latency: float = 0.0) -> dict:
+    """Return {"<benchmark>[<size>]": timings} for every benchmark and size"""
+    results = {}
+
+    with FixtureServer(num_links=max(sizes), latency=http_latency) as server:
+        for size in sizes:
+            cases = {
+                "get_editorial_links": lambda: bench_editorial_links(server, size, repeat),
+                "get_article_content": lambda: bench_article_content(server, size, repeat),
+                "main": lambda: bench_main(server, size, repeat, gemini_latency),
+                "save_results_to_pdf": lambda: bench_pdf(size, repeat),
+                "search_index": lambda: bench_search(size, repeat),
+            }
+            for name, case in cases.items():
+                # The pipeline's progress output would drown the benchmark table
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    timings = case()
+                key = f"{name}[{size}]"
+                results[key] = timings
+                print(f"{key:<32} median {timings['median']:9.4f}s  min {timings['min']:9.4f}s  "
+                      f"max {timings['max']:9.4f}s", flush=True)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Benchmarks whose median is more than `tolerance` slower than the baseline"""
+    regressions = []
+    for key, timings in results.items():
+        if key not in baseline:
+            continue
+        ratio = timings["median"] / baseline[key]["median"]
+        if ratio > 1 + tolerance:
+            regressions.append((key, ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline scraper/analyzer/renderer benchmarks")
+    parser.add_argument("--sizes", default="1,10,100,500", help="Comma-separated article counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gemini-latency", type=float, default=0.05, help="Fake Gemini response time (s)")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Fixture server response time (s)")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, args.repeat, args.gemini_latency, args.http_latency)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for key, ratio in regressions:
+            print(f"❌ {key} is {ratio:.2f}x slower than the baseline")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions")
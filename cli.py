@@ -0,0 +1,214 @@
+import argparse
+
+# Only argparse is imported up front; each command imports what it needs so `--help`
+# and short cron invocations don't load google-genai, BeautifulSoup or ReportLab
+
+
+def _results_store(args):
+    if args.no_store:
+        return None
+    from utils.results_store import ResultsStore
+    return ResultsStore()
+
+
+def _near_duplicates(args, store):
+    # Reused analyses come from the results store, so deduplication needs it
+    if store is None or args.no_dedupe:
+        return None
+    from utils.near_duplicates import NearDuplicateIndex
+    return NearDuplicateIndex(store)
+
+
+def cmd_analyze(args):
+    from main import (main, display_session_info, display_article, display_field,
+                      save_results_to_pdf, save_simple_pdf)
+
+    store = _results_store(args)
+    results = main(
+        args.articles,
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+        on_article=None if args.stream else display_article,
+        batch_size=args.batch_size,
+        deadline_seconds=args.deadline,
+        on_field=display_field if args.stream else None,
+        store=store,
+        duplicates=_near_duplicates(args, store),
+        sources=args.sources.split(",") if args.sources else None,
+        max_per_domain=args.per_domain
+    )
+    if not results:
+        return 1
+
+    display_session_info(results)
+    if args.pdf and not (save_results_to_pdf(results) or save_simple_pdf(results)):
+        return 1
+    return 0
+
+
+def cmd_article(args):
+    from main import analyze_url, display_article, display_field, save_results_to_pdf
+
+    store = _results_store(args)
+    results = analyze_url(args.url, use_cache=not args.no_cache, on_field=display_field if args.stream else None,
+                          store=store, duplicates=_near_duplicates(args, store))
+    if not results:
+        return 1
+
+    if not args.stream:
+        display_article(results["articles_analysis"][0])
+    if args.pdf and not save_results_to_pdf(results):
+        return 1
+    return 0
+
+
+def cmd_query(args):
+    import json
+    from utils.results_store import ResultsStore
+
+    store = ResultsStore(args.db)
+    if args.search:
+        rows = store.search(args.search, limit=args.limit)
+    elif args.word:
+        rows = store.word_usages(args.word)
+    elif args.min_count:
+        rows = store.frequent_words(args.min_count, limit=args.limit)
+    else:
+        rows = store.articles(tone=args.tone, start=args.start, end=args.end, limit=args.limit)
+
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+def cmd_index(args):
+    from utils.results_store import ResultsStore
+    from utils.search_index import SearchIndex
+
+    index = SearchIndex(ResultsStore(args.db), path=args.path)
+    added = index.rebuild() if args.rebuild else index.sync(flush=True)
+    print(f"Indexed {added} articles: {index.stats()}")
+    return 0
+
+
+def cmd_search(args):
+    import json
+    from utils.results_store import ResultsStore
+    from utils.search_index import SearchIndex
+
+    for row in SearchIndex(ResultsStore(args.db), path=args.path).search(args.query, limit=args.limit):
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+def cmd_email(args):
+    from mail_send import build_shared_report, load_subscribers, send_bulk
+
+    path = build_shared_report(args.articles)
+    if not path:
+        return 1
+
+    summary = send_bulk(path, load_subscribers())
+    return 1 if summary["failed"] else 0
+
+
+def cmd_worker(args):
+    import multiprocessing
+    from scripts.jobs import JobQueue, run_worker
+
+    JobQueue(args.db).requeue_stale()
+    processes = [multiprocessing.Process(target=run_worker, args=(args.db,)) for _ in range(args.workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return 0
+
+
+def cmd_serve(args):
+    import uvicorn
+
+    uvicorn.run("api.routes:app", host=args.host, port=args.port)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hindu-analyzer", description="The Hindu editorial analyzer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze = subparsers.add_parser("analyze", help="Scrape and analyze today's editorials")
+    analyze.add_argument("-n", "--articles", type=int, default=1)
+    analyze.add_argument("--pdf", action="store_true", help="Save a PDF report to logs/")
+    analyze.add_argument("--no-cache", action="store_true", help="Ignore the analysis cache")
+    analyze.add_argument("--incremental", action="store_true", help="Skip articles already scraped")
+    analyze.add_argument("--concurrency", type=int, default=4, help="Gemini requests in flight")
+    analyze.add_argument("--rpm", type=float, default=10, help="Gemini requests per minute")
+    analyze.add_argument("--batch-size", type=int, default=1, help="Articles per Gemini request")
+    analyze.add_argument("--deadline", type=float, default=None, help="Retry budget in seconds")
+    analyze.add_argument("--stream", action="store_true", help="Print analysis fields as they stream in")
+    analyze.add_argument("--no-store", action="store_true", help="Don't save results to the results store")
+    analyze.add_argument("--no-dedupe", action="store_true", help="Analyze near-duplicates of stored articles again")
+    analyze.add_argument("--sources", help="Comma-separated newspapers to crawl, e.g. "
+                                           "the_hindu,indian_express,mint,economic_times (-n is per source)")
+    analyze.add_argument("--per-domain", type=int, default=2, help="Concurrent connections per newspaper")
+    analyze.set_defaults(func=cmd_analyze)
+
+    article = subparsers.add_parser("article", help="Analyze a single article URL")
+    article.add_argument("url")
+    article.add_argument("--pdf", action="store_true", help="Save a PDF report to logs/")
+    article.add_argument("--no-cache", action="store_true", help="Ignore the analysis cache")
+    article.add_argument("--stream", action="store_true", help="Print analysis fields as they stream in")
+    article.add_argument("--no-store", action="store_true", help="Don't save results to the results store")
+    article.add_argument("--no-dedupe", action="store_true", help="Analyze near-duplicates of stored articles again")
+    article.set_defaults(func=cmd_article)
+
+    query = subparsers.add_parser("query", help="Query stored analyses (one JSON object per line)")
+    query.add_argument("--tone", help="Only editorials with this tone, e.g. critical")
+    query.add_argument("--start", help="Earliest publication date (YYYY-MM-DD)")
+    query.add_argument("--end", help="Latest publication date (YYYY-MM-DD)")
+    query.add_argument("--search", help="Full-text search query")
+    query.add_argument("--word", help="Articles a vocabulary word was picked from")
+    query.add_argument("--min-count", type=int, help="Vocabulary words seen in at least this many articles")
+    query.add_argument("--limit", type=int, default=100)
+    query.add_argument("--db", default=".cache/results.sqlite")
+    query.set_defaults(func=cmd_query)
+
+    index = subparsers.add_parser("index", help="Bring the search index up to date with the results store")
+    index.add_argument("--rebuild", action="store_true", help="Re-index every stored article from scratch")
+    index.add_argument("--db", default=".cache/results.sqlite")
+    index.add_argument("--path", default=".cache/search")
+    index.set_defaults(func=cmd_index)
+
+    search = subparsers.add_parser("search", help="BM25 search over stored articles and vocabulary")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--db", default=".cache/results.sqlite")
+    search.add_argument("--path", default=".cache/search")
+    search.set_defaults(func=cmd_search)
+
+    email = subparsers.add_parser("email", help="Build today's report and send it to subscribers")
+    email.add_argument("-n", "--articles", type=int, default=2)
+    email.set_defaults(func=cmd_email)
+
+    worker = subparsers.add_parser("worker", help="Run background job workers")
+    worker.add_argument("--workers", type=int, default=2)
+    worker.add_argument("--db", default=".cache/jobs.sqlite")
+    worker.set_defaults(func=cmd_worker)
+
+    serve = subparsers.add_parser("serve", help="Run the API server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
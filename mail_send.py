@@ -2,47 +2,230 @@ from main import main, save_results_to_pdf, save_simple_pdf
 import smtplib
 from email.message import EmailMessage
 import os
+import re
+import time
+import threading
+from email.utils import parseaddr
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from utils.metrics import METRICS
 
-load_dotenv()
+SUBSCRIBERS_FILE = "subscribers.txt"
 
-try:
-    result = main(2)
-    if result:
-        try:
-            path = save_results_to_pdf(result)
-        except:
-            path = save_simple_pdf(result)
-except Exception as e:
-    print(e)
+# Bad credentials or a refused sender fail every message the same way, so retrying is pointless
+FATAL_SMTP_ERRORS = (smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused)
 
-def send_mail(sender=None, reciever=None, app_password=None):
+# One bare address: no display name, whitespace, list separators or header-breaking characters
+EMAIL_ADDRESS = re.compile(r"[^@\s,;:<>()\[\]\"\\]+@[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)+")
 
-    sender_email = sender if sender else os.getenv("sender_mail")
-    receiver_email = reciever if reciever else os.getenv("reciever_mail")
-    app_password = app_password if app_password else os.getenv("gmail_app_pass")
 
+def valid_email(email: str) -> bool:
+    """True if `email` is exactly one plain address, safe to write to the list and to a To header"""
+    if not isinstance(email, str) or len(email) > 254:
+        return False
+    return parseaddr(email)[1] == email and bool(EMAIL_ADDRESS.fullmatch(email))
+
+
+def build_shared_report(num_articles: int = 2, artifacts=None):
+    """Scrape, analyze, render and publish today's report once; later calls reuse the published PDF"""
+    from datetime import date
+    from utils.results_store import ResultsStore
+    from utils.near_duplicates import NearDuplicateIndex
+    from utils.report_artifacts import ReportArtifacts
+
+    artifacts = artifacts or ReportArtifacts()
+    published = artifacts.get(date.today().isoformat())
+    if published:
+        print("📦 Today's report is already published")
+        return artifacts.object_path(published, "pdf")
+
+    store = ResultsStore()
+    result = main(num_articles, store=store, duplicates=NearDuplicateIndex(store))
+    if not result:
+        print("Analysis failed - no report to send")
+        return None
+
+    path = save_results_to_pdf(result)
+    if not path:
+        path = save_simple_pdf(result)
+    if not path:
+        return None
+
+    return artifacts.object_path(artifacts.publish(result, path), "pdf")
+
+
+def load_subscribers(path: str = SUBSCRIBERS_FILE) -> list:
+    """Subscriber emails (one per line), falling back to the reciever_mail env variable"""
+    load_dotenv()
+    subscribers = []
+
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                email = line.strip()
+                if valid_email(email) and email not in subscribers:
+                    subscribers.append(email)
+
+    if not subscribers and os.getenv("reciever_mail"):
+        subscribers.append(os.getenv("reciever_mail"))
+    return subscribers
+
+
+_subscribers_lock = threading.Lock()
+
+
+def add_subscriber(email: str, path: str = SUBSCRIBERS_FILE) -> bool:
+    """Append an email to the subscriber list; returns False if it was already there"""
+    email = email.strip()
+    if not valid_email(email):
+        raise ValueError(f"Invalid email address: {email!r}")
+    with _subscribers_lock:
+        if email in load_subscribers(path):
+            return False
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(email + "\n")
+    return True
+
+
+def build_message(sender_email: str, receiver_email: str, pdf_data: bytes) -> EmailMessage:
+    """Report email for one recipient; the PDF bytes are shared between messages"""
     msg = EmailMessage()
     msg["Subject"] = "Monthly Report"
     msg["From"] = sender_email
     msg["To"] = receiver_email
     msg.set_content("Hi,\n\nPlease find attached today's 'The Hindu Editorial' PDF analysis report.\n\nBest,\nRishabh")
+    msg.add_attachment(pdf_data, maintype="application", subtype="pdf", filename="report.pdf")
+    return msg
+
+
+def send_bulk(pdf_path: str, recipients: list, sender=None, app_password=None, host: str = "smtp.gmail.com",
+              port: int = 465, use_ssl: bool = True, max_connections: int = 2, batch_size: int = 50,
+              max_retries: int = 3, retry_delay: float = 1.0) -> dict:
+    """
+    Send one rendered report to many recipients over a few reused SMTP connections
+
+    Args:
+        pdf_path: Report to attach (read once)
+        recipients: Email addresses
+        sender: Sender address (defaults to the sender_mail env variable)
+        app_password: SMTP password (defaults to the gmail_app_pass env variable)
+        host, port, use_ssl: SMTP server; point these at a local stand-in for testing
+        max_connections: Number of SMTP connections sending concurrently
+        batch_size: Messages sent over a connection before it is recycled
+        max_retries: Attempts per recipient before giving up on it
+        retry_delay: Seconds before the first retry of a recipient, doubled for each further one.
+            Authentication and sender errors are not retried; they end the whole batch.
+
+    Returns:
+        dict: {"sent": [...], "failed": {email: error}}
+    """
+    load_dotenv()
+    sender_email = sender if sender else os.getenv("sender_mail")
+    app_password = app_password if app_password else os.getenv("gmail_app_pass")
 
-    # === Attach the PDF file ===
-    pdf_path = path
     with open(pdf_path, "rb") as f:
         pdf_data = f.read()
-        msg.add_attachment(pdf_data, maintype="application", subtype="pdf", filename="report.pdf")
 
-    # === Send via Gmail SMTP ===
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
+    def connect():
+        smtp = smtplib.SMTP_SSL(host, port) if use_ssl else smtplib.SMTP(host, port)
+        if app_password:
             smtp.login(sender_email, app_password)
-            smtp.send_message(msg)
-        print("Email sent successfully!")
-    except Exception as e:
-        print("Error:", e)
+        return smtp
+
+    # Set by the first authentication/sender error; every connection then stops sending
+    fatal = []
+
+    def send_share(share):
+        sent, failed = [], {}
+        smtp = None
+        sent_on_connection = 0
+
+        for receiver_email in share:
+            if fatal:
+                failed[receiver_email] = fatal[0]
+                continue
+
+            msg = build_message(sender_email, receiver_email, pdf_data)
+
+            for attempt in range(1, max_retries + 1):
+                try:
+                    if smtp is None or sent_on_connection >= batch_size:
+                        if smtp is not None:
+                            smtp.quit()
+                        smtp = connect()
+                        sent_on_connection = 0
+
+                    with METRICS.timer("smtp_send_seconds"):
+                        smtp.send_message(msg)
+                    METRICS.inc("smtp_messages_total")
+                    sent_on_connection += 1
+                    sent.append(receiver_email)
+                    break
+
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Permanent per-recipient failure; the connection is still usable
+                    METRICS.inc("smtp_failures_total")
+                    failed[receiver_email] = str(e)
+                    break
 
-send_mail()
-    
+                except FATAL_SMTP_ERRORS as e:
+                    METRICS.inc("smtp_failures_total")
+                    fatal.append(str(e))
+                    failed[receiver_email] = str(e)
+                    break
 
+                except (smtplib.SMTPException, OSError) as e:
+                    # Drop the connection and retry this recipient on a fresh one after a backoff
+                    try:
+                        if smtp is not None:
+                            smtp.close()
+                    except Exception:
+                        pass
+                    smtp = None
+                    if attempt == max_retries:
+                        METRICS.inc("smtp_failures_total")
+                        failed[receiver_email] = str(e)
+                    else:
+                        time.sleep(retry_delay * 2 ** (attempt - 1))
+
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+        return sent, failed
+
+    workers = max(1, min(max_connections, len(recipients)))
+    shares = [recipients[i::workers] for i in range(workers)]
+
+    summary = {"sent": [], "failed": {}}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for sent, failed in pool.map(send_share, shares):
+            summary["sent"].extend(sent)
+            summary["failed"].update(failed)
+
+    print(f"Email sent to {len(summary['sent'])}/{len(recipients)} recipients")
+    if fatal:
+        print(f"❌ Sending stopped: {fatal[0]}")
+    for receiver_email, error in summary["failed"].items():
+        print(f"Error sending to {receiver_email}: {error}")
+    return summary
+
+
+def send_mail(sender=None, reciever=None, app_password=None, pdf_path=None):
+    """Send a report to a single recipient; without `pdf_path` that is today's shared report"""
+    load_dotenv()
+    receiver_email = reciever if reciever else os.getenv("reciever_mail")
+    pdf_path = pdf_path or build_shared_report()
+    if not pdf_path:
+        return None
+    return send_bulk(pdf_path, [receiver_email], sender=sender, app_password=app_password)
+
+
+if __name__ == "__main__":
+    try:
+        path = build_shared_report(2)
+        if path:
+            send_bulk(path, load_subscribers())
+    except Exception as e:
+        print(e)
@@ -1,131 +1,489 @@
-from scripts.gemini import Gemini
-from scripts.scrapper import Scrapper
-import json
+from utils.rate_limit import TokenBucket
+from utils.analysis_cache import AnalysisCache
+from utils.scrape_index import ScrapeIndex
+from utils.resilience import Deadline
+from utils.metrics import METRICS
+import time
+import queue
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
-from textwrap import fill
 
+# google-genai, BeautifulSoup and ReportLab are imported inside the functions that use them,
+# so the API server and CLI start without paying for them
 
-def main(num_articles: int = 1):
+EDITORIAL_URL = "https://www.thehindu.com/opinion/editorial/"
+
+
+def analyze_article(gemini, article, number: int, limiter: TokenBucket = None, on_field=None):
+    """
+    Analyze a single scraped article and build its report entry
+
+    Args:
+        gemini: Gemini client used for the analysis
+        article: Scraped article dict
+        number: Position of the article in the report
+        limiter: Optional request budget shared between workers
+        on_field: Optional callback(number, event) receiving streamed analysis fields
+    """
+    if article.get("status") == "error":
+        # Scraping failed; don't ask Gemini to analyze the error message
+        gemini_analysis = None
+        latency = 0.0
+    else:
+        started = time.perf_counter()
+        # The limiter is only charged when the analysis isn't cached
+        gemini_analysis = gemini.gemini_response(
+            user_prompt=article["content"],
+            on_field=(lambda event: on_field(number, event)) if on_field else None,
+            limiter=limiter
+        )
+        latency = time.perf_counter() - started
+    print(f"Analyzed article {number} in {latency:.2f}s")
+
+    return {
+        "article_info": {
+            "number": number,
+            "title": article.get("title", "Untitled"),
+            "url": article.get("url", ""),
+            "status": article.get("status", "unknown"),
+            "source": article.get("source", "the_hindu"),
+            "analysis_latency": round(latency, 3)
+        },
+        "original_content": article["content"],
+        "gemini_analysis": gemini_analysis
+    }
+
+
+def save_analyses(results, store=None, duplicates=None):
     """
-    Scrape articles and analyze them with Gemini, returning structured data
+    Save the validated analyses of `results` to the results store and the near-duplicate index.
+    A failure here is logged and doesn't affect the results themselves.
     """
-    gemini = Gemini()
-    scraper = Scrapper(url="https://www.thehindu.com/opinion/editorial/")
+    from scripts.gemini import is_valid_analysis
 
+    valid = {
+        **results,
+        "articles_analysis": [entry for entry in results["articles_analysis"]
+                              if entry["gemini_analysis"] and is_valid_analysis(entry["gemini_analysis"])]
+    }
     try:
-        output = scraper.scrape_articles(num_articles=num_articles)
-        
-        
-        if output:
-            
-            output_dict = json.loads(output)
-            
-            # Create structured analysis results
-            analysis_results = {
-                "session_info": {
-                    "timestamp": datetime.now().isoformat(),
-                    "total_articles": len(output_dict["articles"]),
-                    "analysis_status": "completed"
-                },
-                "articles_analysis": []
-            }
-            
-            for idx, article in enumerate(output_dict["articles"], 1):
-                print(f"Analyzing article {idx}/{len(output_dict['articles'])}...")
-                
-                # Get Gemini analysis
-                gemini_analysis = gemini.gemini_response(user_prompt=article["content"])
-                
-                # Structure the article data
-                article_analysis = {
-                    "article_info": {
-                        "number": idx,
-                        "title": article.get("title", "Untitled"),
-                        "url": article.get("url", ""),
-                        "status": article.get("status", "unknown")
-                    },
-                    "original_content": article["content"],
-                    "gemini_analysis": gemini_analysis
-                }
-                
-                analysis_results["articles_analysis"].append(article_analysis)
-            
-            return analysis_results
+        if store:
+            store.save_results(valid)
+        if duplicates:
+            duplicates.record(valid)
+    except Exception as e:
+        METRICS.inc("store_errors_total")
+        print(f"⚠️ Could not save the analyses: {e}")
+
+
+def reused_entry(number: int, article, reused, on_field=None):
+    """
+    Report entry for an article whose near-duplicate was already analyzed
+
+    Args:
+        number: Position of the article in the report
+        article: Scraped article dict
+        reused: (analysis, url, similarity) from NearDuplicateIndex.reuse
+        on_field: Optional callback(number, event) receiving the reused analysis fields
+    """
+    gemini_analysis, duplicate_of, similarity = reused
+    print(f"Reused analysis of {duplicate_of} for article {number} ({similarity:.0%} similar)")
+
+    if on_field:
+        from scripts.gemini import replay_fields
+
+        replay_fields(gemini_analysis, lambda event: on_field(number, event))
+
+    return {
+        "article_info": {
+            "number": number,
+            "title": article.get("title", "Untitled"),
+            "url": article.get("url", ""),
+            "status": article.get("status", "unknown"),
+            "source": article.get("source", "the_hindu"),
+            "analysis_latency": 0.0,
+            "duplicate_of": duplicate_of,
+            "similarity": similarity
+        },
+        "original_content": article["content"],
+        "gemini_analysis": gemini_analysis
+    }
+
+
+def analyze_batch(gemini, numbered_articles, limiter: TokenBucket = None, on_field=None):
+    """
+    Analyze several articles with one batched Gemini request
+
+    Args:
+        gemini: Gemini client used for the analysis
+        numbered_articles: List of (number, article) pairs
+        limiter: Optional request budget shared between workers
+
+    Returns:
+        list: Article analysis entries for the batch
+    """
+    if len(numbered_articles) == 1:
+        number, article = numbered_articles[0]
+        return [analyze_article(gemini, article, number, limiter, on_field)]
+
+    started = time.perf_counter()
+    analyses = gemini.gemini_batch_response([article["content"] for _, article in numbered_articles],
+                                            limiter=limiter)
+    latency = time.perf_counter() - started
+    print(f"Analyzed articles {', '.join(str(number) for number, _ in numbered_articles)} in {latency:.2f}s")
+
+    if on_field:
+        # Batched responses aren't streamed; emit their fields once the batch is back
+        from scripts.gemini import replay_fields
+
+        for (number, _), gemini_analysis in zip(numbered_articles, analyses):
+            if gemini_analysis:
+                replay_fields(gemini_analysis, lambda event: on_field(number, event))
+
+    return [
+        {
+            "article_info": {
+                "number": number,
+                "title": article.get("title", "Untitled"),
+                "url": article.get("url", ""),
+                "status": article.get("status", "unknown"),
+                "source": article.get("source", "the_hindu"),
+                "analysis_latency": round(latency, 3)
+            },
+            "original_content": article["content"],
+            "gemini_analysis": gemini_analysis
+        }
+        for (number, article), gemini_analysis in zip(numbered_articles, analyses)
+    ]
+
+
+def iter_analysis(gemini, articles, max_concurrency: int = 4, requests_per_minute: float = 10,
+                  batch_size: int = 1, on_field=None, duplicates=None):
+    """
+    Analyze articles as they arrive, yielding each report entry as soon as it is ready
+
+    Args:
+        gemini: Gemini client used for the analysis
+        articles: Iterable of scraped article dicts, e.g. Scrapper.iter_articles()
+        max_concurrency: Maximum number of Gemini requests in flight
+        requests_per_minute: Request budget for the Gemini API (<= 0 disables it)
+        batch_size: Articles packed into each Gemini request
+        on_field: Optional callback(number, event) receiving streamed analysis fields
+        duplicates: Optional NearDuplicateIndex; near-duplicates of analyzed articles skip Gemini
+
+    Yields:
+        dict: Article analysis entries in completion order
+    """
+    limiter = TokenBucket(rate=requests_per_minute / 60, capacity=max_concurrency)
+    finished = queue.Queue()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        def submit(batch):
+            future = pool.submit(analyze_batch, gemini, batch, limiter, on_field)
+            future.add_done_callback(finished.put)
+
+        def feed():
+            # Runs in its own thread so scraping and analysis overlap
+            submitted = 0
+            batch = []
+            try:
+                for idx, article in enumerate(articles, 1):
+                    number = article.get("article_number", idx)
+                    if article.get("status") == "error":
+                        submit([(number, article)])
+                        submitted += 1
+                        continue
+
+                    reused = duplicates.reuse(article["content"], url=article["url"]) if duplicates else None
+                    if reused:
+                        future = pool.submit(lambda *args: [reused_entry(*args)], number, article, reused, on_field)
+                        future.add_done_callback(finished.put)
+                        submitted += 1
+                        continue
+
+                    batch.append((number, article))
+                    if len(batch) >= batch_size:
+                        submit(batch)
+                        submitted += 1
+                        batch = []
+                if batch:
+                    submit(batch)
+                    submitted += 1
+            except Exception as e:
+                finished.put(e)
+            finished.put(submitted)
+
+        threading.Thread(target=feed, daemon=True).start()
+
+        total = None
+        done = 0
+        while total is None or done < total:
+            item = finished.get()
+
+            if isinstance(item, Exception):
+                raise item
+            if isinstance(item, int):
+                total = item
+                continue
+
+            done += 1
+            yield from item.result()
+
+
+def analyze_articles(gemini, articles, max_concurrency: int = 4, requests_per_minute: float = 10,
+                     batch_size: int = 1):
+    """
+    Analyze scraped articles with Gemini concurrently
+
+    Returns:
+        list: Article analysis entries in the same order as `articles`
+    """
+    return sorted(
+        iter_analysis(gemini, articles, max_concurrency, requests_per_minute, batch_size),
+        key=lambda entry: entry["article_info"]["number"]
+    )
+
+
+def main(num_articles: int = 1, max_concurrency: int = 4, requests_per_minute: float = 10,
+         use_cache: bool = True, incremental: bool = False, on_article=None, batch_size: int = 1,
+         deadline_seconds: float = None, editorial_url: str = EDITORIAL_URL,
+         requests_per_second: float = 2.0, gemini=None, on_field=None, store=None, duplicates=None,
+         sources=None, max_per_domain: int = 2):
+    """
+    Scrape articles and analyze them with Gemini, returning structured data.
+    Articles are analyzed while the remaining ones are still being scraped.
+
+    Args:
+        num_articles: Number of editorials to analyze (per source when `sources` is given)
+        max_concurrency: Maximum number of Gemini requests in flight
+        requests_per_minute: Request budget for the Gemini API
+        use_cache: Reuse analyses stored in the on-disk analysis cache
+        incremental: Use conditional requests and skip articles already in the scrape index
+        on_article: Optional callback receiving each article entry as soon as it is analyzed
+        batch_size: Articles packed into each Gemini request (1 disables batching)
+        deadline_seconds: Overall time budget for retries of HTTP and Gemini calls
+        editorial_url: Editorial index page to scrape
+        requests_per_second: Politeness limit for article requests, per site (<= 0 disables it)
+        gemini: Optional pre-built Gemini client; `use_cache` and `deadline_seconds` don't apply to it
+        on_field: Optional callback(number, event) receiving each analysis field as it streams in
+        store: Optional ResultsStore the analyzed articles are saved to
+        duplicates: Optional NearDuplicateIndex (over the same store) used to reuse the analysis of
+            republished or lightly edited editorials instead of calling Gemini
+        sources: Optional source names/adapters (scripts/sources.py) crawled concurrently instead
+            of `editorial_url`
+        max_per_domain: Concurrent connections per site when crawling `sources`
+    """
+    from scripts.gemini import Gemini
+    from scripts.scrapper import Scrapper
+    from scripts.crawler import Crawler
+
+    cache = AnalysisCache() if use_cache and gemini is None else None
+    deadline = Deadline(deadline_seconds)
+    gemini = gemini or Gemini(cache=cache, deadline=deadline)
+    index = ScrapeIndex() if incremental else None
+
+    try:
+        # Create structured analysis results
+        analysis_results = {
+            "session_info": {
+                "timestamp": datetime.now().isoformat(),
+                "total_articles": 0,
+                "analysis_status": "completed"
+            },
+            "articles_analysis": []
+        }
+
+        print(f"Scraping and analyzing up to {num_articles} articles...")
+        started = time.perf_counter()
+        metrics_baseline = METRICS.snapshot()
+
+        if sources:
+            crawler = Crawler(sources, max_per_domain=max_per_domain, requests_per_second=requests_per_second,
+                              index=index, deadline=deadline)
+            articles = crawler.iter_articles(num_articles)
+        else:
+            scraper = Scrapper(url=editorial_url, index=index, deadline=deadline)
+            articles = scraper.iter_articles(num_articles=num_articles, requests_per_second=requests_per_second)
+        for article_analysis in iter_analysis(gemini, articles, max_concurrency, requests_per_minute, batch_size,
+                                              on_field, duplicates):
+            analysis_results["articles_analysis"].append(article_analysis)
+            if on_article:
+                on_article(article_analysis)
+
+        analysis_results["articles_analysis"].sort(key=lambda entry: entry["article_info"]["number"])
+        analysis_results["session_info"]["total_articles"] = len(analysis_results["articles_analysis"])
+        analysis_results["session_info"]["analysis_seconds"] = round(time.perf_counter() - started, 3)
+        if cache:
+            analysis_results["session_info"]["cache"] = cache.stats()
+        analysis_results["session_info"]["metrics"] = METRICS.summary(since=metrics_baseline)
+        save_analyses(analysis_results, store, duplicates)
+
+        return analysis_results
             
     except Exception as e:
         print(f"Error in main function: {e}")
         return None
 
 
-def format_and_display_results(results):
+def analyze_url(url: str, use_cache: bool = True, on_field=None, store=None, duplicates=None):
     """
-    Format and display the analysis results in a readable way
+    Scrape and analyze a single article URL, returning results shaped like main().
+    `on_field(number, event)` receives streamed analysis fields; `store` and `duplicates` are
+    an optional ResultsStore and NearDuplicateIndex as in main().
+    """
+    from scripts.gemini import Gemini
+    from scripts.scrapper import Scrapper
+    from scripts.sources import source_for_url
+
+    cache = AnalysisCache() if use_cache else None
+    gemini = Gemini(cache=cache)
+
+    try:
+        started = time.perf_counter()
+        metrics_baseline = METRICS.snapshot()
+        scraper = Scrapper(url, source=source_for_url(url))
+        article = {
+            "article_number": 1,
+            "url": url,
+            "title": scraper.get_article_title(),
+            "content": scraper.get_article_content(),
+            "status": "error" if scraper.error else "success",
+            "source": scraper.source.name
+        }
+
+        reused = (duplicates.reuse(article["content"], url=url)
+                  if duplicates and article["status"] == "success" else None)
+        if reused:
+            articles_analysis = [reused_entry(1, article, reused, on_field)]
+        else:
+            articles_analysis = [analyze_article(gemini, article, 1, on_field=on_field)]
+
+        results = {
+            "session_info": {
+                "timestamp": datetime.now().isoformat(),
+                "total_articles": 1,
+                "analysis_status": "completed",
+                "analysis_seconds": round(time.perf_counter() - started, 3),
+                "metrics": METRICS.summary(since=metrics_baseline)
+            },
+            "articles_analysis": articles_analysis
+        }
+        save_analyses(results, store, duplicates)
+        return results
+
+    except Exception as e:
+        print(f"Error analyzing {url}: {e}")
+        return None
+
+
+def display_session_info(results):
+    """
+    Print the report header and session summary
     """
-    if not results:
-        print("No results to display")
-        return
-    
     print("\n" + "="*80)
     print("THE HINDU EDITORIAL ANALYSIS REPORT")
     print("="*80)
     
-    # Display session info
     session = results["session_info"]
     print(f"Analysis completed at: {session['timestamp']}")
     print(f"Total articles analyzed: {session['total_articles']}")
     print(f"Status: {session['analysis_status']}")
+
+    stages = session.get("metrics", {}).get("stages", {})
+    for name, stage in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+        print(f"  {name}: {stage['count']} x {stage['mean']:.3f}s (total {stage['total']:.2f}s)")
+
+
+def display_article(article_data):
+    """
+    Print a single article analysis entry
+    """
+    article_info = article_data["article_info"]
+    analysis = article_data["gemini_analysis"]
     
-    # Display each article analysis
-    for article_data in results["articles_analysis"]:
-        article_info = article_data["article_info"]
-        analysis = article_data["gemini_analysis"]
+    print("\n" + "-"*80)
+    print(f"ARTICLE {article_info['number']}: {article_info['title']}")
+    print("-"*80)
+    print(f"URL: {article_info['url']}")
+    print(f"Status: {article_info['status']}")
+    if article_info.get("duplicate_of"):
+        print(f"Near-duplicate of: {article_info['duplicate_of']} ({article_info['similarity']:.0%} similar)")
+    
+    if analysis:
+        print("\n📝 CENTRAL IDEA:")
+        print(f"   {analysis.get('central_idea', 'Not available')}")
         
-        print("\n" + "-"*80)
-        print(f"ARTICLE {article_info['number']}: {article_info['title']}")
-        print("-"*80)
-        print(f"URL: {article_info['url']}")
-        print(f"Status: {article_info['status']}")
+        print(f"\n🎭 AUTHOR'S TONE: {analysis.get('tone_of_author', 'Not available').upper()}")
         
-        if analysis:
-            print("\n📝 CENTRAL IDEA:")
-            print(f"   {analysis.get('central_idea', 'Not available')}")
-            
-            print(f"\n🎭 AUTHOR'S TONE: {analysis.get('tone_of_author', 'Not available').upper()}")
-            
-            print("\n📚 PARAGRAPH-WISE SUMMARY:")
-            for i, summary in enumerate(analysis.get('paragraph_wise_summary', []), 1):
-                print(f"   {i}. {summary}")
-            
-            print("\n📖 VOCABULARY BUILDER:")
-            for vocab in analysis.get('vocabulary_builder', []):
-                print(f"   • {vocab.get('word', 'N/A')}: {vocab.get('meaning', 'N/A')}")
-                print(f"     Example: {vocab.get('example_usage', 'N/A')}")
-            
-            print("\n🤔 CRITICAL THINKING QUESTIONS:")
-            for i, question in enumerate(analysis.get('critical_thinking_questions', []), 1):
-                print(f"   {i}. {question.get('question', 'N/A')} ({question.get('question_type', 'N/A')})")
-            
-            print("\n💡 KEY TAKEAWAY:")
-            print(f"   {analysis.get('takeaway', 'Not available')}")
-        else:
-            print("\n❌ Gemini analysis failed for this article")
+        print("\n📚 PARAGRAPH-WISE SUMMARY:")
+        for i, summary in enumerate(analysis.get('paragraph_wise_summary', []), 1):
+            print(f"   {i}. {summary}")
+        
+        print("\n📖 VOCABULARY BUILDER:")
+        for vocab in analysis.get('vocabulary_builder', []):
+            print(f"   • {vocab.get('word', 'N/A')}: {vocab.get('meaning', 'N/A')}")
+            print(f"     Example: {vocab.get('example_usage', 'N/A')}")
+        
+        print("\n🤔 CRITICAL THINKING QUESTIONS:")
+        for i, question in enumerate(analysis.get('critical_thinking_questions', []), 1):
+            print(f"   {i}. {question.get('question', 'N/A')} ({question.get('question_type', 'N/A')})")
         
-        print("\n" + "="*40 + " ORIGINAL CONTENT " + "="*40)
-        content = article_data["original_content"]
-        print(content)
+        print("\n💡 KEY TAKEAWAY:")
+        print(f"   {analysis.get('takeaway', 'Not available')}")
+    else:
+        print("\n❌ Gemini analysis failed for this article")
+    
+    print("\n" + "="*40 + " ORIGINAL CONTENT " + "="*40)
+    content = article_data["original_content"]
+    print(content)
+
+
+def display_field(number, event):
+    """
+    Print one streamed analysis field as soon as it arrives (for on_field)
+    """
+    if event["type"] == "retry":
+        print(f"[{number}] ↻ Restarting analysis: {event['reason']}")
+        return
+
+    field, index, value = event["field"], event["index"], event["value"]
+    if field == "central_idea":
+        print(f"[{number}] 📝 Central idea: {value}")
+    elif field == "tone_of_author":
+        print(f"[{number}] 🎭 Tone: {str(value).upper()}")
+    elif field == "paragraph_wise_summary":
+        print(f"[{number}] 📚 ¶{index + 1}: {value}")
+    elif field == "vocabulary_builder":
+        print(f"[{number}] 📖 {value.get('word', 'N/A')}: {value.get('meaning', 'N/A')}")
+    elif field == "critical_thinking_questions":
+        print(f"[{number}] 🤔 Q{index + 1}: {value.get('question', 'N/A')}")
+    elif field == "takeaway":
+        print(f"[{number}] 💡 Takeaway: {value}")
+
+
+def format_and_display_results(results):
+    """
+    Format and display the analysis results in a readable way
+    """
+    if not results:
+        print("No results to display")
+        return
+    
+    display_session_info(results)
+    
+    # Display each article analysis
+    for article_data in results["articles_analysis"]:
+        display_article(article_data)
 
 
 def save_results_to_pdf(results, filename=None):
     """
     Save the analysis results to a well-formatted PDF file
     """
+    from scripts.report import get_report_template
+
     if not results:
         print("No results to save")
         return
@@ -139,210 +497,8 @@ def save_results_to_pdf(results, filename=None):
     filepath = os.path.join("logs", filename)
     
     try:
-        # Create PDF document
-        doc = SimpleDocTemplate(filepath, pagesize=A4, 
-                              rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=12,
-            textColor=colors.darkred
-        )
-        
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            spaceBefore=8,
-            textColor=colors.darkgreen
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            alignment=TA_JUSTIFY
-        )
-        
-        bullet_style = ParagraphStyle(
-            'BulletStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=4,
-            leftIndent=20,
-            bulletIndent=10
-        )
-        
-        # Build content
-        content = []
-        
-        # Title page
-        content.append(Paragraph("THE HINDU EDITORIAL ANALYSIS REPORT", title_style))
-        content.append(Spacer(1, 20))
-        
-        # Session info
-        session = results["session_info"]
-        session_info = f"""
-        <b>Analysis Date:</b> {datetime.fromisoformat(session['timestamp']).strftime('%B %d, %Y at %I:%M %p')}<br/>
-        <b>Total Articles Analyzed:</b> {session['total_articles']}<br/>
-        <b>Status:</b> {session['analysis_status'].title()}
-        """
-        content.append(Paragraph(session_info, body_style))
-        content.append(Spacer(1, 30))
-        
-        # Table of contents
-        content.append(Paragraph("TABLE OF CONTENTS", heading_style))
-        toc_data = [["Article", "Title", "Page"]]
-        
-        for i, article_data in enumerate(results["articles_analysis"], 1):
-            title = article_data["article_info"]["title"][:50] + ("..." if len(article_data["article_info"]["title"]) > 50 else "")
-            toc_data.append([f"Article {i}", title, f"{i}"])
-        
-        toc_table = Table(toc_data, colWidths=[1*inch, 4*inch, 1*inch])
-        toc_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        content.append(toc_table)
-        content.append(PageBreak())
-        
-        # Process each article
-        for idx, article_data in enumerate(results["articles_analysis"], 1):
-            article_info = article_data["article_info"]
-            analysis = article_data["gemini_analysis"]
-            
-            # Article header
-            content.append(Paragraph(f"ARTICLE {idx}: {article_info['title']}", title_style))
-            content.append(Spacer(1, 12))
-            
-            # Article metadata
-            metadata = f"""
-            <b>URL:</b> {article_info['url']}<br/>
-            <b>Status:</b> {article_info['status'].title()}
-            """
-            content.append(Paragraph(metadata, body_style))
-            content.append(Spacer(1, 20))
-            
-            # Original Content FIRST
-            content.append(Paragraph("📰 ORIGINAL EDITORIAL CONTENT", heading_style))
-            original_content = article_data["original_content"]
-            
-            # Split content into paragraphs for better formatting
-            paragraphs = original_content.split('\n')
-            for para in paragraphs:
-                if para.strip():
-                    content.append(Paragraph(para.strip(), body_style))
-            
-            content.append(Spacer(1, 30))
-            content.append(Paragraph("─" * 80, body_style))
-            content.append(Spacer(1, 20))
-            
-            # THEN Analysis
-            if analysis:
-                content.append(Paragraph("🔍 GEMINI ANALYSIS", heading_style))
-                content.append(Spacer(1, 12))
-                
-                # Central Idea
-                content.append(Paragraph("📝 CENTRAL IDEA", subheading_style))
-                content.append(Paragraph(analysis.get('central_idea', 'Not available'), body_style))
-                content.append(Spacer(1, 12))
-                
-                # Author's Tone
-                content.append(Paragraph("🎭 AUTHOR'S TONE", subheading_style))
-                content.append(Paragraph(f"<b>{analysis.get('tone_of_author', 'Not available').upper()}</b>", body_style))
-                content.append(Spacer(1, 12))
-                
-                # Paragraph-wise Summary
-                content.append(Paragraph("📚 PARAGRAPH-WISE SUMMARY", subheading_style))
-                for i, summary in enumerate(analysis.get('paragraph_wise_summary', []), 1):
-                    content.append(Paragraph(f"{i}. {summary}", bullet_style))
-                content.append(Spacer(1, 12))
-                
-                # Vocabulary Builder with better text wrapping
-                content.append(Paragraph("📖 VOCABULARY BUILDER", subheading_style))
-                vocab_data = [["Word", "Meaning", "Example Usage"]]
-                
-                for vocab in analysis.get('vocabulary_builder', []):
-                    word = vocab.get('word', 'N/A')
-                    meaning = vocab.get('meaning', 'N/A')
-                    example = vocab.get('example_usage', 'N/A')
-                    
-                    # Use Paragraph objects for better text wrapping in cells
-                    word_para = Paragraph(f"<b>{word}</b>", ParagraphStyle('WordStyle', parent=body_style, fontSize=9))
-                    meaning_para = Paragraph(meaning, ParagraphStyle('MeaningStyle', parent=body_style, fontSize=8))
-                    example_para = Paragraph(example, ParagraphStyle('ExampleStyle', parent=body_style, fontSize=8))
-                    
-                    vocab_data.append([word_para, meaning_para, example_para])
-                
-                # Adjusted column widths to fit page better
-                vocab_table = Table(vocab_data, colWidths=[1.2*inch, 2.8*inch, 2.8*inch])
-                vocab_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('TOPPADDING', (0, 1), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightcyan),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP')
-                ]))
-                
-                content.append(vocab_table)
-                content.append(Spacer(1, 12))
-                
-                # Critical Thinking Questions
-                content.append(Paragraph("🤔 CRITICAL THINKING QUESTIONS", subheading_style))
-                for i, question in enumerate(analysis.get('critical_thinking_questions', []), 1):
-                    q_text = question.get('question', 'N/A')
-                    q_type = question.get('question_type', 'N/A')
-                    content.append(Paragraph(f"{i}. {q_text} <i>({q_type})</i>", bullet_style))
-                content.append(Spacer(1, 12))
-                
-                # Key Takeaway
-                content.append(Paragraph("💡 KEY TAKEAWAY", subheading_style))
-                content.append(Paragraph(analysis.get('takeaway', 'Not available'), body_style))
-                content.append(Spacer(1, 20))
-            else:
-                content.append(Paragraph("❌ Gemini analysis failed for this article", body_style))
-                content.append(Spacer(1, 20))
-            
-            # Add page break except for the last article
-            if idx < len(results["articles_analysis"]):
-                content.append(PageBreak())
-        
-        # Build PDF
-        doc.build(content)
+        # Styles and static flowables are shared across renders
+        get_report_template().render(results, filepath)
         print(f"\n📄 PDF report saved to: {filepath}")
         return filepath
         
@@ -351,10 +507,36 @@ def save_results_to_pdf(results, filename=None):
         return None
 
 
+def save_reports_to_pdf(results_list, filenames=None, max_workers=None):
+    """
+    Save many analysis results (e.g. per subscriber, date range or archive month) as PDFs,
+    rendering them in parallel worker processes
+
+    Returns:
+        list: File path (or None on failure) for each report, in input order
+    """
+    from scripts.report import render_reports
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if not filenames:
+        filenames = [f"editorial_analysis_{timestamp}_{i}.pdf" for i in range(1, len(results_list) + 1)]
+
+    os.makedirs("logs", exist_ok=True)
+    jobs = [(results, os.path.join("logs", filename)) for results, filename in zip(results_list, filenames)]
+
+    paths = render_reports(jobs, max_workers=max_workers)
+    print(f"\n📄 {sum(1 for path in paths if path)}/{len(paths)} PDF reports saved to: logs/")
+    return paths
+
+
 def save_simple_pdf(results, filename=None):
     """
     Create a simpler PDF as a fallback option
     """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
     if not results:
         print("No results to save")
         return
@@ -412,12 +594,11 @@ def save_simple_pdf(results, filename=None):
 
 
 if __name__ == "__main__":
-    # Run analysis
-    results = main(1)
+    # Run analysis, printing each article as soon as it is analyzed
+    results = main(1, on_article=display_article)
     
     if results:
-        # Display formatted results
-        format_and_display_results(results)
+        display_session_info(results)
         
         # Try to save detailed PDF, fallback to simple PDF if needed
         # pdf_path = save_results_to_pdf(results)
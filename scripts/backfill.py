@@ -0,0 +1,206 @@
+import os
+import json
+import argparse
+import threading
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.scrapper import Scrapper, create_session
+from utils.rate_limit import TokenBucket
+
+ARCHIVE_URL = "https://www.thehindu.com/archive/web/{year}/{month:02d}/{day:02d}/"
+
+
+class Backfill:
+    """Walk the editorial archive day by day, analyzing every editorial exactly once"""
+
+    def __init__(self, gemini, start_date: date, end_date: date, output_dir: str = "logs/backfill",
+                 archive_url: str = ARCHIVE_URL, link_prefix: str = None, max_concurrency: int = 4,
+                 requests_per_second: float = 2.0, requests_per_minute: float = 10, store=None,
+                 duplicates=None):
+        """
+        Args:
+            gemini: Gemini client used for the analysis
+            start_date: First archive day to process
+            end_date: Last archive day to process (inclusive)
+            output_dir: Directory holding the checkpoint and the analyses JSONL file
+            archive_url: Day page URL template with {year}, {month} and {day} fields
+            link_prefix: Replaces https://www.thehindu.com in article links (e.g. a fixture server)
+            max_concurrency: Maximum number of articles scraped/analyzed at once
+            requests_per_second: Politeness limit for thehindu.com
+            requests_per_minute: Request budget for the Gemini API
+            store: Optional ResultsStore each analysis is also saved to, dated by its archive day
+            duplicates: Optional NearDuplicateIndex over `store`; near-duplicates reuse a stored analysis
+        """
+        self.gemini = gemini
+        self.start_date = start_date
+        self.end_date = end_date
+        self.archive_url = archive_url
+        self.link_prefix = link_prefix
+        self.max_concurrency = max_concurrency
+        self.http_limiter = TokenBucket(rate=requests_per_second, capacity=max_concurrency)
+        self.gemini_limiter = TokenBucket(rate=requests_per_minute / 60, capacity=max_concurrency)
+        self.session = create_session(pool_size=max_concurrency)
+        self.store = store
+        self.duplicates = duplicates
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.checkpoint_path = os.path.join(output_dir, "checkpoint.json")
+        self.output_path = os.path.join(output_dir, "analyses.jsonl")
+        self.lock = threading.Lock()
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> dict:
+        """Load progress from a previous run, if any"""
+        checkpoint = {"completed_days": [], "processed_urls": [], "failed_urls": {}}
+
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint.update(json.load(f))
+
+        self.completed_days = set(checkpoint["completed_days"])
+        self.processed_urls = set(checkpoint["processed_urls"])
+        return checkpoint
+
+    def _save_checkpoint(self):
+        """Atomically persist progress; callers must hold self.lock"""
+        self.checkpoint["completed_days"] = sorted(self.completed_days)
+        self.checkpoint["processed_urls"] = sorted(self.processed_urls)
+
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def archive_links(self, day: date) -> list:
+        """Editorial links listed on the archive page for `day`"""
+        url = self.archive_url.format(year=day.year, month=day.month, day=day.day)
+
+        self.http_limiter.acquire()
+        links = Scrapper(url, session=self.session).get_archive_links()
+
+        if self.link_prefix:
+            links = [link.replace("https://www.thehindu.com", self.link_prefix, 1) for link in links]
+        return links
+
+    def process_article(self, day: date, url: str) -> bool:
+        """Scrape and analyze one article, recording the result; returns True on success"""
+        try:
+            self.http_limiter.acquire()
+            article_scrapper = Scrapper(url, session=self.session)
+            if not article_scrapper.text:
+                raise RuntimeError("article page could not be fetched")
+
+            title = article_scrapper.get_article_title()
+            content = article_scrapper.get_article_content()
+
+            reused = self.duplicates.reuse(content, url=url) if self.duplicates else None
+            if reused:
+                gemini_analysis = reused[0]
+                print(f"♻️ {url}: reusing the analysis of {reused[1]} ({reused[2]:.0%} similar)")
+            else:
+                gemini_analysis = self.gemini.gemini_response(user_prompt=content, limiter=self.gemini_limiter)
+                if gemini_analysis is None:
+                    raise RuntimeError("Gemini analysis failed")
+
+        except Exception as e:
+            print(f"❌ {url}: {e}")
+            with self.lock:
+                self.checkpoint["failed_urls"][url] = str(e)
+                self._save_checkpoint()
+            return False
+
+        record = {
+            "date": day.isoformat(),
+            "article_info": {"title": title, "url": url, "status": "success"},
+            "original_content": content,
+            "gemini_analysis": gemini_analysis
+        }
+
+        with self.lock:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.processed_urls.add(url)
+            self.checkpoint["failed_urls"].pop(url, None)
+            self._save_checkpoint()
+
+        if self.store:
+            self.store.save_articles([{
+                "url": url,
+                "title": title,
+                "published_on": day.isoformat(),
+                "status": "success",
+                "content": content,
+                "analysis": gemini_analysis
+            }])
+            if self.duplicates and not reused:
+                self.duplicates.add(url, content)
+
+        print(f"✅ {day.isoformat()} {title}")
+        return True
+
+    def run(self) -> dict:
+        """Process every day in the range, skipping work recorded in the checkpoint"""
+        summary = {"days": 0, "analyzed": 0, "skipped": 0, "failed": 0}
+        day = self.start_date
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as pool:
+            while day <= self.end_date:
+                if day.isoformat() in self.completed_days:
+                    day += timedelta(days=1)
+                    continue
+
+                links = self.archive_links(day)
+                pending = [link for link in links if link not in self.processed_urls]
+                summary["skipped"] += len(links) - len(pending)
+                print(f"📅 {day.isoformat()}: {len(links)} editorials, {len(pending)} to analyze")
+
+                results = list(pool.map(lambda link: self.process_article(day, link), pending))
+                summary["analyzed"] += sum(results)
+                summary["failed"] += len(results) - sum(results)
+                summary["days"] += 1
+
+                # Only days without failures are skipped next time; failed URLs get retried
+                if links and all(results):
+                    with self.lock:
+                        self.completed_days.add(day.isoformat())
+                        self._save_checkpoint()
+
+                day += timedelta(days=1)
+
+        return summary
+
+
+if __name__ == "__main__":
+    from scripts.gemini import Gemini
+    from utils.analysis_cache import AnalysisCache
+    from utils.results_store import ResultsStore
+    from utils.near_duplicates import NearDuplicateIndex
+
+    parser = argparse.ArgumentParser(description="Backfill analyses of archived Hindu editorials")
+    parser.add_argument("--start", required=True, help="First day, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="Last day, YYYY-MM-DD")
+    parser.add_argument("--output-dir", default="logs/backfill")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=2.0, help="Requests per second to thehindu.com")
+    parser.add_argument("--rpm", type=float, default=10, help="Gemini requests per minute")
+    parser.add_argument("--archive-url", default=ARCHIVE_URL)
+    parser.add_argument("--link-prefix", default=None)
+    parser.add_argument("--no-store", action="store_true", help="Don't save analyses to the results store")
+    args = parser.parse_args()
+
+    store = None if args.no_store else ResultsStore()
+    backfill = Backfill(
+        Gemini(cache=AnalysisCache()),
+        start_date=datetime.strptime(args.start, "%Y-%m-%d").date(),
+        end_date=datetime.strptime(args.end, "%Y-%m-%d").date(),
+        output_dir=args.output_dir,
+        archive_url=args.archive_url,
+        link_prefix=args.link_prefix,
+        max_concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        requests_per_minute=args.rpm,
+        store=store,
+        duplicates=NearDuplicateIndex(store) if store else None
+    )
+    print(json.dumps(backfill.run(), indent=2))
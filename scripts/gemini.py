@@ -1,18 +1,15 @@
-from google import genai
 import os
-import sys
 import json
-from google.genai import types
+import itertools
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Annotated
 from enum import Enum
-from dotenv import load_dotenv
-
-# Add parent directory to Python path to import utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.prompt_updated import system_prompt
-
-load_dotenv()
+from utils.analysis_cache import make_cache_key
+from utils.resilience import call_with_resilience, get_breaker
+from utils.metrics import METRICS, record_gemini_usage
+from utils.text_prep import estimate_tokens, strip_boilerplate, chunk_paragraphs
+from utils.json_stream import IncrementalJSONParser, MalformedJSON
 
 class AuthorTone(str, Enum):
     """Enumeration of possible author tones"""
@@ -74,8 +71,109 @@ class EditorialAnalysis(BaseModel):
     )
 
 
+class BatchAnalysisItem(BaseModel):
+    """Analysis of one editorial inside a batch request"""
+    article_id: int = Field(description="The id attribute of the <editorial> this analysis belongs to")
+    analysis: EditorialAnalysis
+
+
+class EditorialBatchAnalysis(BaseModel):
+    """Analyses of several editorials returned by a single request"""
+    analyses: List[BatchAnalysisItem] = Field(description="Exactly one entry per editorial in the request")
+
+
+class ChunkNotes(BaseModel):
+    """Condensed notes on one part of a long editorial (map step of chunked analysis)"""
+    paragraph_wise_summary: List[str] = Field(description="1-2 sentences for each paragraph in this part, in order")
+    key_points: List[str] = Field(description="The main arguments and claims made in this part")
+    vocabulary_candidates: List[VocabularyWord] = Field(description="Up to 4 advanced words from this part",
+                                                        max_length=4)
+
+
+class OutputTruncated(Exception):
+    """Raised when a response stopped at max_output_tokens, leaving incomplete JSON"""
+
+
+def is_truncated(response) -> bool:
+    candidates = getattr(response, "candidates", None) or []
+    finish_reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    return finish_reason is not None and str(finish_reason).endswith("MAX_TOKENS")
+
+
+def is_valid_analysis(analysis) -> bool:
+    """True if `analysis` conforms to EditorialAnalysis (raw unvalidated output may not)"""
+    try:
+        EditorialAnalysis.model_validate(analysis)
+        return True
+    except Exception:
+        return False
+
+
+def replay_fields(analysis: dict, on_field):
+    """Emit a finished analysis as the field events a stream would have produced"""
+    for field, value in analysis.items():
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                on_field({"type": "field", "field": field, "index": index, "value": item})
+        else:
+            on_field({"type": "field", "field": field, "index": None, "value": value})
+
+
+def chunk_prompt(number: int, total: int, text: str) -> str:
+    return (f"This is part {number} of {total} of a long editorial. Do not analyze it yet; take notes "
+            f"for the final analysis.\n\n<part>\n{text}\n</part>")
+
+
+def reduce_prompt(notes: List[ChunkNotes]) -> str:
+    """Final-analysis prompt built from the notes of every part, in order"""
+    parts = ["The editorial was too long to send at once. Below are notes on each of its parts, in order. "
+             "Write the analysis of the whole editorial from them; give one summary sentence per part "
+             "in paragraph_wise_summary and pick the vocabulary from the candidates."]
+    for number, chunk_notes in enumerate(notes, 1):
+        parts.append(f'<part id="{number}">\n{chunk_notes.model_dump_json()}\n</part>')
+    return "\n\n".join(parts)
+
+
+def batch_prompt(user_prompts: List[str]) -> str:
+    """Pack several editorials into one user prompt, tagged with their ids"""
+    parts = [
+        f"Analyze each of the following {len(user_prompts)} editorials independently. "
+        "Return exactly one analysis per editorial, using its id as article_id."
+    ]
+    for article_id, text in enumerate(user_prompts, 1):
+        parts.append(f'<editorial id="{article_id}">\n{text.strip()}\n</editorial>')
+    return "\n\n".join(parts)
+
+
 class Gemini:
-    def __init__(self, api_key=os.getenv("GEMINI_API_KEY")):
+    def __init__(self, api_key=None, cache=None, deadline=None, client=None, max_input_tokens: int = 2500,
+                 chunk_tokens: int = 1200):
+        """
+        Args:
+            api_key: Gemini API key (defaults to the GEMINI_API_KEY env variable)
+            cache: Optional AnalysisCache used to skip repeated analyses
+            deadline: Optional resilience Deadline bounding retries of every request
+            client: Optional object with a genai-compatible `models.generate_content`, used
+                instead of a real client (e.g. the offline benchmark stand-in)
+            max_input_tokens: Estimated input size above which an editorial is analyzed in chunks
+            chunk_tokens: Estimated size of each chunk
+        """
+        self.cache = cache
+        self.deadline = deadline
+        self.max_input_tokens = max_input_tokens
+        self.chunk_tokens = chunk_tokens
+
+        if client is not None:
+            self.client = client
+            return
+
+        # google-genai takes ~0.5s to import, so only pay for it when a real client is needed
+        from google import genai
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        api_key = api_key if api_key else os.getenv("GEMINI_API_KEY")
+
         try:
             self.client = genai.Client(
                 api_key=api_key,
@@ -85,49 +183,324 @@ class Gemini:
             print(f"Error initializing Gemini client: {e}")
             raise
     
-    def gemini_response(self, user_prompt: str, model="gemini-2.5-flash"):
+    def _generate(self, model: str, **kwargs):
+        """generate_content with backoff on 429/5xx and a per-model circuit breaker"""
+        with METRICS.timer("gemini_request_seconds"):
+            response = call_with_resilience(
+                self.client.models.generate_content,
+                model=model,
+                breaker=get_breaker(f"gemini:{model}"),
+                deadline=self.deadline,
+                **kwargs
+            )
+        METRICS.inc("gemini_requests_total")
+        record_gemini_usage(response)
+        return response
+
+    @staticmethod
+    def cache_key(user_prompt: str, model: str) -> str:
+        """Cache key covering everything that determines the analysis"""
+        return make_cache_key(user_prompt, model, system_prompt(), EditorialAnalysis.model_json_schema())
+
+    def prepare_input(self, user_prompt: str) -> str:
+        """Strip boilerplate the scraper let through, so it isn't paid for as input tokens"""
+        text = strip_boilerplate(user_prompt)
+        METRICS.inc("input_tokens_stripped_total", estimate_tokens(user_prompt) - estimate_tokens(text))
+        return text
+
+    @staticmethod
+    def _analysis_config():
+        from google.genai import types
+
+        return types.GenerateContentConfig(
+            system_instruction=system_prompt(),
+            response_mime_type="application/json",
+            response_schema=EditorialAnalysis,
+            temperature=0.3,  
+            max_output_tokens=3000,  
+        )
+
+    @staticmethod
+    def _validate(parsed_response):
+        """Validate with the Pydantic model, but return raw data if validation fails"""
+        try:
+            with METRICS.timer("validation_seconds"):
+                validated_analysis = EditorialAnalysis.model_validate(parsed_response)
+            return validated_analysis.model_dump(mode="json"), True
+        except Exception as validation_error:
+            METRICS.inc("validation_failures_total")
+            print(f"Validation warning: {validation_error}")
+            print("Returning raw response data...")
+            return parsed_response, False
+
+    def _analyze(self, contents: str, model: str, limiter=None):
+        """
+        One EditorialAnalysis request, charged to `limiter` when given
+
+        Returns:
+            tuple: (analysis, validated). analysis is None on failure; unvalidated raw data is
+                returned with validated=False. Raises OutputTruncated if the JSON was cut off.
+        """
+        try:
+            if limiter:
+                limiter.acquire()
+            response = self._generate(model=model, contents=contents, config=self._analysis_config())
+
+            if is_truncated(response):
+                METRICS.inc("gemini_truncated_total")
+                raise OutputTruncated("Response hit max_output_tokens")
+            
+            return self._validate(json.loads(response.text))
+
+        except OutputTruncated:
+            raise
+        except json.JSONDecodeError as e:
+            print(f"Error parsing JSON response: {e}")
+            print(f"Raw response: {response.text}")
+            return None, False
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            return None, False
+
+    def _analyze_stream(self, contents: str, model: str, on_field, max_attempts: int = 2, limiter=None):
+        """
+        Streamed variant of _analyze that calls `on_field` with each field as soon as it is
+        complete. A stream that stops being valid JSON is abandoned at the first bad
+        character and restarted (after a {"type": "retry"} event) instead of being read to the end.
+        Every attempt is charged to `limiter` when given.
+        """
+        config = self._analysis_config()
+
+        def open_stream():
+            stream = iter(self.client.models.generate_content_stream(model=model, contents=contents, config=config))
+            # Throttling and server errors surface with the first chunk, so fetch it under the retry policy
+            return next(stream, None), stream
+
+        for attempt in range(1, max_attempts + 1):
+            parser = IncrementalJSONParser()
+            stream = last = None
+
+            try:
+                if limiter:
+                    limiter.acquire()
+                with METRICS.timer("gemini_request_seconds"):
+                    with METRICS.timer("gemini_first_chunk_seconds"):
+                        first, stream = call_with_resilience(
+                            open_stream,
+                            breaker=get_breaker(f"gemini:{model}"),
+                            deadline=self.deadline
+                        )
+
+                    for chunk in itertools.chain([first] if first is not None else [], stream):
+                        last = chunk
+                        for field, index, value in parser.feed(chunk.text or ""):
+                            on_field({"type": "field", "field": field, "index": index, "value": value})
+
+                METRICS.inc("gemini_requests_total")
+                # Usage metadata on the final chunk covers the whole response
+                record_gemini_usage(last)
+
+                if last is not None and is_truncated(last):
+                    METRICS.inc("gemini_truncated_total")
+                    raise OutputTruncated("Response hit max_output_tokens")
+
+                return self._validate(parser.close())
+
+            except MalformedJSON as e:
+                METRICS.inc("gemini_stream_retries_total")
+                print(f"Malformed streamed JSON: {e}")
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+                if attempt < max_attempts:
+                    on_field({"type": "retry", "reason": str(e)})
+            except OutputTruncated:
+                raise
+            except Exception as e:
+                print(f"Error generating content: {e}")
+                return None, False
+
+        return None, False
+
+    def chunked_response(self, text: str, model="gemini-2.5-flash", limiter=None):
+        """
+        Map-reduce analysis for editorials too long for one request: each chunk is condensed
+        into ChunkNotes, then one request turns the notes into the EditorialAnalysis. The
+        per-chunk paragraph summaries replace the reduce step's, so every paragraph is covered.
+        Each map request and the reduce request are charged to `limiter` when given.
+
+        Returns:
+            tuple: (analysis, validated) as for _analyze
         """
-        Generate structured editorial analysis using the latest Gemini API features
+        from google.genai import types
+
+        chunks = chunk_paragraphs(text, self.chunk_tokens)
+        METRICS.inc("chunked_analyses_total")
+        print(f"Analyzing long editorial in {len(chunks)} chunks")
+
+        notes = []
+        for number, chunk in enumerate(chunks, 1):
+            try:
+                if limiter:
+                    limiter.acquire()
+                response = self._generate(
+                    model=model,
+                    contents=chunk_prompt(number, len(chunks), chunk),
+                    config=types.GenerateContentConfig(
+                        system_instruction=system_prompt(),
+                        response_mime_type="application/json",
+                        response_schema=ChunkNotes,
+                        temperature=0.3,
+                        max_output_tokens=2000,
+                    ),
+                )
+                with METRICS.timer("validation_seconds"):
+                    notes.append(ChunkNotes.model_validate_json(response.text))
+            except Exception as e:
+                print(f"Error analyzing chunk {number}/{len(chunks)}: {e}")
+                return None, False
+
+        analysis, validated = self._analyze(reduce_prompt(notes), model, limiter)
+        if validated:
+            analysis["paragraph_wise_summary"] = [
+                summary for chunk_notes in notes for summary in chunk_notes.paragraph_wise_summary
+            ]
+        return analysis, validated
+
+    def gemini_response(self, user_prompt: str, model="gemini-2.5-flash", on_field=None, limiter=None):
+        """
+        Generate structured editorial analysis using the latest Gemini API features.
+        Long editorials are analyzed in chunks instead of risking a truncated response.
         
         Args:
             user_prompt: The editorial text to analyze
             model: The Gemini model to use
+            on_field: Optional callback; when given the response is streamed and the callback
+                receives {"type": "field", "field", "index", "value"} for each completed field
+                (index is set for list items), plus {"type": "retry"} when a stream restarts.
+                Cached and chunked analyses are replayed through it field by field.
+            limiter: Optional TokenBucket request budget; a token is taken before every request
+                (each chunk of a long editorial counts), so cached analyses don't use it up
             
         Returns:
             dict: Parsed JSON response conforming to EditorialAnalysis schema
         """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache_key(user_prompt, model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if on_field:
+                    replay_fields(cached, on_field)
+                return cached
+
+        text = self.prepare_input(user_prompt)
+        streamed = False
+
         try:
-            response = self.client.models.generate_content(
-                model=model,
-                contents=user_prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_prompt(),
-                    response_mime_type="application/json",
-                    response_schema=EditorialAnalysis,
-                    temperature=0.3,  
-                    max_output_tokens=3000,  
-                ),
-            )
-            
-            
-            parsed_response = json.loads(response.text)
-            
-            # Try to validate with the Pydantic model, but return raw data if validation fails
-            try:
-                validated_analysis = EditorialAnalysis.model_validate(parsed_response)
-                return validated_analysis.model_dump()
-            except Exception as validation_error:
-                print(f"Validation warning: {validation_error}")
-                print("Returning raw response data...")
-                return parsed_response
-            
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON response: {e}")
-            print(f"Raw response: {response.text}")
-            return None
-        except Exception as e:
+            if estimate_tokens(text) > self.max_input_tokens:
+                result, validated = self.chunked_response(text, model, limiter)
+            else:
+                try:
+                    if on_field:
+                        result, validated = self._analyze_stream(text, model, on_field, limiter=limiter)
+                        streamed = True
+                    else:
+                        result, validated = self._analyze(text, model, limiter)
+                except OutputTruncated:
+                    print("Response was truncated, retrying in chunks")
+                    if on_field:
+                        on_field({"type": "retry", "reason": "truncated"})
+                    result, validated = self.chunked_response(text, model, limiter)
+        except OutputTruncated as e:
             print(f"Error generating content: {e}")
             return None
+
+        if on_field and result and not streamed:
+            replay_fields(result, on_field)
+
+        if validated and cache_key:
+            self.cache.set(cache_key, result)
+        return result
+
+    def gemini_batch_response(self, user_prompts: List[str], model="gemini-2.5-flash",
+                              max_output_tokens: int = 65536, limiter=None):
+        """
+        Analyze several editorials with a single request, sending the system prompt once
+
+        Args:
+            user_prompts: The editorial texts to analyze
+            model: The Gemini model to use
+            max_output_tokens: Upper bound for the whole batch response
+            limiter: Optional TokenBucket request budget, charged once for the batch request and
+                once per fallback call; fully cached batches take no tokens
+
+        Returns:
+            list: One analysis dict (or None) per editorial, in input order. Editorials missing
+                from the batch response or failing validation are retried with gemini_response,
+                as are editorials long enough to need chunked analysis.
+        """
+        results = [None] * len(user_prompts)
+        pending = []
+        texts = {}
+
+        for position, user_prompt in enumerate(user_prompts):
+            cached = self.cache.get(self.cache_key(user_prompt, model)) if self.cache else None
+            if cached is not None:
+                results[position] = cached
+                continue
+
+            pending.append(position)
+            text = self.prepare_input(user_prompt)
+            if estimate_tokens(text) <= self.max_input_tokens:
+                texts[position] = text
+
+        batched = list(texts)
+        if len(batched) > 1:
+            from google.genai import types
+
+            if limiter:
+                limiter.acquire()
+
+            try:
+                response = self._generate(
+                    model=model,
+                    contents=batch_prompt([texts[position] for position in batched]),
+                    config=types.GenerateContentConfig(
+                        system_instruction=system_prompt(),
+                        response_mime_type="application/json",
+                        response_schema=EditorialBatchAnalysis,
+                        temperature=0.3,
+                        max_output_tokens=min(max_output_tokens, 3000 * len(batched)),
+                    ),
+                )
+                items = json.loads(response.text).get("analyses", [])
+            except Exception as e:
+                print(f"Batch analysis failed, falling back to per-article calls: {e}")
+                items = []
+
+            for item in items:
+                article_id = item.get("article_id") if isinstance(item, dict) else None
+                if not isinstance(article_id, int) or not 1 <= article_id <= len(batched):
+                    continue
+
+                position = batched[article_id - 1]
+                try:
+                    with METRICS.timer("validation_seconds"):
+                        analysis = EditorialAnalysis.model_validate(item.get("analysis")).model_dump(mode="json")
+                except Exception as validation_error:
+                    METRICS.inc("validation_failures_total")
+                    print(f"Validation warning for batch item {article_id}: {validation_error}")
+                    continue
+
+                results[position] = analysis
+                if self.cache:
+                    self.cache.set(self.cache_key(user_prompts[position], model), analysis)
+
+        for position in pending:
+            if results[position] is None:
+                results[position] = self.gemini_response(user_prompts[position], model=model, limiter=limiter)
+
+        return results
     
 if __name__ == "__main__":
     client = Gemini()
@@ -0,0 +1,394 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import multiprocessing
+from datetime import date
+from contextlib import contextmanager
+
+from utils.db import connect
+
+JOBS_DB = ".cache/jobs.sqlite"
+JOB_OUTPUT_DIR = os.path.join("logs", "jobs")
+ACTIVE_STATES = ("queued", "running")
+
+# A failed job is retried after 30s, 60s, 120s, ... (at most 15 minutes)
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 900
+
+# What POST /jobs may queue: kinds whose only inputs are an article count or a known newspaper URL.
+# Render/email jobs read files and send mail, so they are only created by workers and operators.
+API_KINDS = ("scrape", "analyze", "report")
+# Highest priority POST /jobs may ask for; operators enqueueing from the command line can go above it
+API_MAX_PRIORITY = 5
+
+# Workers put jobs whose worker died mid-run back on the queue this often
+STALE_CHECK_INTERVAL = 60
+
+
+class JobQueue:
+    """Persistent SQLite job queue with priorities, deduplication and progress tracking"""
+
+    def __init__(self, path: str = JOBS_DB):
+        self.path = path
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    worker TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    not_before REAL
+                )"""
+            )
+            # Queues created before failed jobs were retried with a delay
+            if "not_before" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN not_before REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(state, priority DESC, id)")
+            # At most one queued/running job per dedupe key
+            conn.execute(
+                """CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key)
+                   WHERE dedupe_key IS NOT NULL AND state IN ('queued', 'running')"""
+            )
+
+    @contextmanager
+    def _connect(self):
+        with connect(self.path, isolation_level=None) as conn:
+            conn.row_factory = sqlite3.Row
+            yield conn
+
+    def enqueue(self, kind: str, payload: dict = None, priority: int = 0, dedupe_key: str = None,
+                max_attempts: int = 3) -> int:
+        """Queue a job and return its id, or the id of the active job with the same dedupe key"""
+        with self._connect() as conn:
+            while True:
+                try:
+                    cursor = conn.execute(
+                        """INSERT INTO jobs (kind, payload, dedupe_key, priority, max_attempts, created_at)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        (kind, json.dumps(payload or {}), dedupe_key, priority, max_attempts, time.time())
+                    )
+                    return cursor.lastrowid
+                except sqlite3.IntegrityError:
+                    row = conn.execute(
+                        "SELECT id FROM jobs WHERE dedupe_key = ? AND state IN (?, ?)",
+                        (dedupe_key, *ACTIVE_STATES)
+                    ).fetchone()
+                    # The duplicate may have finished in between; then the insert can succeed now
+                    if row:
+                        return row["id"]
+
+    def claim(self, worker: str):
+        """Atomically move the highest-priority queued job to running and return it"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """SELECT id FROM jobs WHERE state = 'queued' AND (not_before IS NULL OR not_before <= ?)
+                   ORDER BY priority DESC, id LIMIT 1""",
+                (time.time(),)
+            ).fetchone()
+
+            if not row:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                """UPDATE jobs SET state = 'running', worker = ?, started_at = ?, attempts = attempts + 1,
+                   progress = 0, message = NULL WHERE id = ?""",
+                (worker, time.time(), row["id"])
+            )
+            conn.execute("COMMIT")
+
+        return self.get(row["id"])
+
+    def update_progress(self, job_id: int, progress: float, message: str = None):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET progress = ?, message = ? WHERE id = ?", (progress, message, job_id))
+
+    def complete(self, job_id: int, result=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'done', progress = 1, result = ?, error = NULL, finished_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id: int, error: str):
+        """Requeue the job after a backoff delay if it has attempts left, otherwise mark it failed"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE jobs SET error = ?,
+                   finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+                   not_before = ? + min(?, ? * (1 << (attempts - 1))),
+                   state = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END
+                   WHERE id = ?""",
+                (error, now, now, RETRY_MAX_DELAY, RETRY_BASE_DELAY, job_id)
+            )
+
+    def requeue_stale(self, timeout_seconds: float = 3600) -> int:
+        """Put jobs whose worker died mid-run back on the queue"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = 'queued', worker = NULL WHERE state = 'running' AND started_at < ?",
+                (time.time() - timeout_seconds,)
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: int):
+        """Return a job as a dict, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if not row:
+            return None
+
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+def _job_output(job_id, name: str) -> str:
+    """Path of a job's output file; job ids are integers, so payloads can't point anywhere else"""
+    return os.path.join(JOB_OUTPUT_DIR, f"{int(job_id)}_{name}.json")
+
+
+def _write_json(job_id: int, name: str, data) -> str:
+    os.makedirs(JOB_OUTPUT_DIR, exist_ok=True)
+    path = _job_output(job_id, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def handle_scrape(job, progress):
+    from scripts.scrapper import Scrapper
+
+    num_articles = job["payload"].get("num_articles", 2)
+    progress(0.1, "Scraping editorial index")
+    output = Scrapper("https://www.thehindu.com/opinion/editorial/").scrape_articles(num_articles=num_articles)
+    return {"articles_path": _write_json(job["id"], "articles", json.loads(output))}
+
+
+def handle_analyze(job, progress):
+    from main import main, analyze_url
+    from utils.results_store import ResultsStore
+    from utils.near_duplicates import NearDuplicateIndex
+
+    payload = job["payload"]
+    store = ResultsStore()
+    duplicates = NearDuplicateIndex(store)
+    if payload.get("url"):
+        progress(0.1, f"Analyzing {payload['url']}")
+        results = analyze_url(payload["url"], store=store, duplicates=duplicates)
+    else:
+        num_articles = payload.get("num_articles", 2)
+        done = []
+        progress(0.05, f"Analyzing {num_articles} articles")
+        results = main(
+            num_articles,
+            on_article=lambda entry: (done.append(entry),
+                                      progress(len(done) / num_articles * 0.95, f"Analyzed {len(done)}/{num_articles}")),
+            store=store,
+            duplicates=duplicates
+        )
+
+    if not results:
+        raise RuntimeError("Analysis failed")
+    return {"results_path": _write_json(job["id"], "results", results)}
+
+
+def handle_render(job, progress):
+    """Render the results of a finished analyze (or report) job, given as payload["analyze_job"]"""
+    from main import save_results_to_pdf, save_simple_pdf
+
+    results = _read_json(_job_output(job["payload"]["analyze_job"], "results"))
+    progress(0.2, "Rendering PDF")
+    pdf_path = save_results_to_pdf(results) or save_simple_pdf(results)
+    if not pdf_path:
+        raise RuntimeError("PDF generation failed")
+    return {"pdf_path": pdf_path}
+
+
+def handle_email(job, progress):
+    """Email a published daily report (payload["date"], default the latest) to the subscriber list"""
+    from mail_send import send_bulk, load_subscribers
+    from utils.report_artifacts import ReportArtifacts
+
+    day = job["payload"].get("date", "latest")
+    artifacts = ReportArtifacts()
+    entry = artifacts.get(day)
+    if not entry:
+        raise RuntimeError(f"No report published for {day}")
+
+    recipients = load_subscribers()
+    progress(0.1, f"Sending to {len(recipients)} recipients")
+    summary = send_bulk(artifacts.object_path(entry, "pdf"), recipients)
+    return {"report_date": entry["date"], "sent": len(summary["sent"]), "failed": summary["failed"]}
+
+
+def handle_report(job, progress):
+    """Daily pipeline in one job: analyze, render and publish once, then email subscribers if asked"""
+    from utils.report_artifacts import ReportArtifacts
+
+    payload = job["payload"]
+    artifacts = ReportArtifacts()
+    # Single-article reports aren't a day's report; those are rendered but neither published nor emailed
+    daily = not payload.get("url")
+    published = artifacts.get(date.today().isoformat()) if daily and not payload.get("republish") else None
+
+    if published:
+        progress(0.85, "Reusing today's published report")
+        result = {"pdf_path": artifacts.object_path(published, "pdf"), "report_date": published["date"]}
+    else:
+        analyzed = handle_analyze(job, lambda value, message: progress(value * 0.7, message))
+        progress(0.75, "Rendering PDF")
+        rendered = handle_render({"id": job["id"], "payload": {"analyze_job": job["id"]}}, lambda value, message: None)
+        result = {**analyzed, "pdf_path": rendered["pdf_path"]}
+
+        if daily:
+            progress(0.85, "Publishing report")
+            entry = artifacts.publish(_read_json(analyzed["results_path"]), rendered["pdf_path"],
+                                      replace=bool(payload.get("republish")))
+            result.update(pdf_path=artifacts.object_path(entry, "pdf"), report_date=entry["date"])
+
+    if daily and payload.get("email"):
+        progress(0.9, "Emailing subscribers")
+        result.update(handle_email({"id": job["id"], "payload": {"date": result["report_date"]}}, lambda *a: None))
+    return result
+
+
+HANDLERS = {
+    "scrape": handle_scrape,
+    "analyze": handle_analyze,
+    "render": handle_render,
+    "email": handle_email,
+    "report": handle_report,
+}
+
+
+def api_payload(kind: str, payload: dict) -> dict:
+    """
+    Validated payload for a job requested through the public API
+
+    Only API_KINDS are accepted, and of their payload only `num_articles` (1-5) and, for
+    analyze, a `url` on a known newspaper site; everything else is dropped.
+
+    Raises:
+        ValueError: For other kinds or invalid values
+    """
+    from scripts.sources import is_source_url
+
+    if kind not in API_KINDS:
+        raise ValueError(f"Job kind {kind!r} can't be queued through the API")
+
+    clean = {}
+    if "num_articles" in payload:
+        num_articles = payload["num_articles"]
+        if isinstance(num_articles, bool) or not isinstance(num_articles, int) or not 1 <= num_articles <= 5:
+            raise ValueError("num_articles must be an integer from 1 to 5")
+        clean["num_articles"] = num_articles
+
+    if payload.get("url") is not None:
+        if kind != "analyze" or not isinstance(payload["url"], str) or not is_source_url(payload["url"]):
+            raise ValueError("url must be an https article URL on a known newspaper site (analyze jobs only)")
+        clean["url"] = payload["url"]
+
+    return clean
+
+
+def dedupe_key_for(kind: str, payload: dict):
+    """Jobs for the same article URL (or the same day's batch) share one active job"""
+    if payload.get("url"):
+        return f"{kind}:{payload['url']}"
+    if kind in ("scrape", "analyze", "report"):
+        return f"{kind}:{date.today().isoformat()}:{payload.get('num_articles', 2)}:{bool(payload.get('email'))}"
+    return None
+
+
+def run_worker(db_path: str = JOBS_DB, poll_interval: float = 1.0, once: bool = False,
+               stale_check_interval: float = STALE_CHECK_INTERVAL):
+    """Claim and execute jobs until interrupted (or until the queue is empty with `once`)"""
+    queue = JobQueue(db_path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Worker {worker} started")
+    next_stale_check = 0
+
+    while True:
+        # Another worker may have died since startup; its jobs would otherwise stay 'running' for good
+        if time.monotonic() >= next_stale_check:
+            requeued = queue.requeue_stale()
+            if requeued:
+                print(f"♻️ Requeued {requeued} stale jobs")
+            next_stale_check = time.monotonic() + stale_check_interval
+
+        job = queue.claim(worker)
+        if not job:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        print(f"▶️ Job {job['id']} ({job['kind']})")
+        handler = HANDLERS.get(job["kind"])
+
+        try:
+            if not handler:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            result = handler(job, lambda value, message=None: queue.update_progress(job["id"], value, message))
+            queue.complete(job["id"], result)
+            print(f"✅ Job {job['id']} done")
+        except Exception as e:
+            queue.fail(job["id"], str(e))
+            print(f"❌ Job {job['id']} failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Background job queue for analysis and report generation")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Run worker processes")
+    worker_parser.add_argument("--workers", type=int, default=2)
+    worker_parser.add_argument("--db", default=JOBS_DB)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Queue a job")
+    enqueue_parser.add_argument("kind", choices=sorted(HANDLERS))
+    enqueue_parser.add_argument("--payload", default="{}", help="JSON payload")
+    enqueue_parser.add_argument("--priority", type=int, default=0)
+    enqueue_parser.add_argument("--db", default=JOBS_DB)
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        payload = json.loads(args.payload)
+        job_id = JobQueue(args.db).enqueue(args.kind, payload, args.priority, dedupe_key_for(args.kind, payload))
+        print(f"Queued job {job_id}")
+    else:
+        processes = [multiprocessing.Process(target=run_worker, args=(args.db,)) for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
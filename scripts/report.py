@@ -0,0 +1,469 @@
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream, PDFZCompress
+
+from utils.metrics import METRICS
+
+
+def _page_form(idx: int) -> str:
+    return f"toc_page_{idx}"
+
+
+class ArticleSection(Flowable):
+    """
+    Placeholder for one article in the story. ReportDocTemplate expands it into the article's
+    flowables only when it reaches the front of the story, so a report never holds the parsed
+    paragraphs of more than one article at a time.
+    """
+
+    def __init__(self, template, idx: int, article_data):
+        super().__init__()
+        self.template = template
+        self.idx = idx
+        self.article_data = article_data
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+    def expand(self) -> list:
+        return [ArticleStart(self.idx)] + self.template.article_section(self.idx, self.article_data)
+
+
+class ArticleStart(Flowable):
+    """Zero-size marker drawn where an article begins; fills in its TOC page number"""
+
+    def __init__(self, idx: int):
+        super().__init__()
+        self.idx = idx
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        canv = self.canv
+        page = canv.getPageNumber()
+        # The TOC was drawn before this page existed; define the form its page cell refers to
+        canv.beginForm(_page_form(self.idx))
+        canv.setFont("Helvetica", 10)
+        canv.drawString(0, 0, str(page))
+        canv.endForm()
+
+
+class PageRef(Flowable):
+    """TOC cell showing the page an article starts on, as a forward reference to a PDF form"""
+
+    def __init__(self, idx: int):
+        super().__init__()
+        self.idx = idx
+
+    def wrap(self, availWidth, availHeight):
+        return availWidth, 10
+
+    def draw(self):
+        self.canv.doForm(_page_form(self.idx))
+
+
+class ReportCanvas(Canvas):
+    """
+    Canvas that compresses each page's content stream as soon as the page is finished, instead of
+    keeping every page's drawing operators as text until the whole document is saved
+    """
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if page.stream:
+            contents = PDFStream(content=PDFZCompress.encode(page.stream))
+            contents.dictionary["Filter"] = PDFArray([PDFName(PDFZCompress.pdfname)])
+            contents.__Comment__ = "page stream"
+            page.Contents = contents
+            page.stream = None
+
+
+class ReportDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate that expands ArticleSection placeholders as the build reaches them"""
+
+    def filterFlowables(self, flowables):
+        if flowables and isinstance(flowables[0], ArticleSection):
+            flowables[0:1] = flowables[0].expand()
+
+    def build(self, flowables, **kwargs):
+        kwargs.setdefault("canvasmaker", ReportCanvas)
+        super().build(flowables, **kwargs)
+
+
+class ReportTemplate:
+    """Styles and table styles built once and shared by every report render"""
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        )
+
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            spaceBefore=12,
+            textColor=colors.darkred
+        )
+
+        self.subheading_style = ParagraphStyle(
+            'CustomSubHeading',
+            parent=styles['Heading3'],
+            fontSize=12,
+            spaceAfter=8,
+            spaceBefore=8,
+            textColor=colors.darkgreen
+        )
+
+        self.body_style = ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=6,
+            alignment=TA_JUSTIFY
+        )
+
+        self.bullet_style = ParagraphStyle(
+            'BulletStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=4,
+            leftIndent=20,
+            bulletIndent=10
+        )
+
+        # Vocabulary table cell styles (previously rebuilt for every word)
+        self.word_style = ParagraphStyle('WordStyle', parent=self.body_style, fontSize=9)
+        self.meaning_style = ParagraphStyle('MeaningStyle', parent=self.body_style, fontSize=8)
+        self.example_style = ParagraphStyle('ExampleStyle', parent=self.body_style, fontSize=8)
+
+        self.toc_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+        self.vocab_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightcyan),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP')
+        ])
+
+        # Text and style of the fixed headings; their Paragraphs are built per render because reportlab
+        # keeps layout state (canvas, postponed mark, split) on the flowable itself
+        self.static_text = {
+            "report_title": ("THE HINDU EDITORIAL ANALYSIS REPORT", self.title_style),
+            "toc_heading": ("TABLE OF CONTENTS", self.heading_style),
+            "original_heading": ("📰 ORIGINAL EDITORIAL CONTENT", self.heading_style),
+            "separator": ("─" * 80, self.body_style),
+            "analysis_heading": ("🔍 GEMINI ANALYSIS", self.heading_style),
+            "central_idea_heading": ("📝 CENTRAL IDEA", self.subheading_style),
+            "tone_heading": ("🎭 AUTHOR'S TONE", self.subheading_style),
+            "summary_heading": ("📚 PARAGRAPH-WISE SUMMARY", self.subheading_style),
+            "vocabulary_heading": ("📖 VOCABULARY BUILDER", self.subheading_style),
+            "questions_heading": ("🤔 CRITICAL THINKING QUESTIONS", self.subheading_style),
+            "takeaway_heading": ("💡 KEY TAKEAWAY", self.subheading_style),
+            "analysis_failed": ("❌ Gemini analysis failed for this article", self.body_style),
+        }
+
+    def static(self, name: str) -> Paragraph:
+        """A fresh Paragraph for one of the fixed headings"""
+        text, style = self.static_text[name]
+        return Paragraph(text, style)
+
+    def title_page(self, results) -> list:
+        """Report title, session summary and table of contents"""
+        content = [self.static("report_title"), Spacer(1, 20)]
+
+        session = results["session_info"]
+        session_info = f"""
+        <b>Analysis Date:</b> {datetime.fromisoformat(session['timestamp']).strftime('%B %d, %Y at %I:%M %p')}<br/>
+        <b>Total Articles Analyzed:</b> {session['total_articles']}<br/>
+        <b>Status:</b> {session['analysis_status'].title()}
+        """
+        content.append(Paragraph(session_info, self.body_style))
+        content.append(Spacer(1, 30))
+
+        content.append(self.static("toc_heading"))
+        toc_data = [["Article", "Title", "Page"]]
+
+        for i, article_data in enumerate(results["articles_analysis"], 1):
+            title = article_data["article_info"]["title"][:50] + ("..." if len(article_data["article_info"]["title"]) > 50 else "")
+            toc_data.append([f"Article {i}", title, PageRef(i)])
+
+        toc_table = Table(toc_data, colWidths=[1*inch, 4*inch, 1*inch])
+        toc_table.setStyle(self.toc_table_style)
+
+        content.append(toc_table)
+        content.append(PageBreak())
+        return content
+
+    def article_section(self, idx: int, article_data) -> list:
+        """Flowables for one article: original text followed by the Gemini analysis"""
+        article_info = article_data["article_info"]
+        analysis = article_data["gemini_analysis"]
+        content = []
+
+        # Article header
+        content.append(Paragraph(f"ARTICLE {idx}: {article_info['title']}", self.title_style))
+        content.append(Spacer(1, 12))
+
+        # Article metadata
+        metadata = f"""
+        <b>URL:</b> {article_info['url']}<br/>
+        <b>Status:</b> {article_info['status'].title()}
+        """
+        content.append(Paragraph(metadata, self.body_style))
+        content.append(Spacer(1, 20))
+
+        # Original Content FIRST
+        content.append(self.static("original_heading"))
+
+        # Split content into paragraphs for better formatting
+        for para in article_data["original_content"].split('\n'):
+            if para.strip():
+                content.append(Paragraph(para.strip(), self.body_style))
+
+        content.append(Spacer(1, 30))
+        content.append(self.static("separator"))
+        content.append(Spacer(1, 20))
+
+        # THEN Analysis
+        if not analysis:
+            content.append(self.static("analysis_failed"))
+            content.append(Spacer(1, 20))
+            return content
+
+        content.append(self.static("analysis_heading"))
+        content.append(Spacer(1, 12))
+
+        # Central Idea
+        content.append(self.static("central_idea_heading"))
+        content.append(Paragraph(analysis.get('central_idea', 'Not available'), self.body_style))
+        content.append(Spacer(1, 12))
+
+        # Author's Tone
+        content.append(self.static("tone_heading"))
+        content.append(Paragraph(f"<b>{analysis.get('tone_of_author', 'Not available').upper()}</b>", self.body_style))
+        content.append(Spacer(1, 12))
+
+        # Paragraph-wise Summary
+        content.append(self.static("summary_heading"))
+        for i, summary in enumerate(analysis.get('paragraph_wise_summary', []), 1):
+            content.append(Paragraph(f"{i}. {summary}", self.bullet_style))
+        content.append(Spacer(1, 12))
+
+        # Vocabulary Builder with Paragraph cells for text wrapping
+        content.append(self.static("vocabulary_heading"))
+        vocab_data = [["Word", "Meaning", "Example Usage"]]
+
+        for vocab in analysis.get('vocabulary_builder', []):
+            vocab_data.append([
+                Paragraph(f"<b>{vocab.get('word', 'N/A')}</b>", self.word_style),
+                Paragraph(vocab.get('meaning', 'N/A'), self.meaning_style),
+                Paragraph(vocab.get('example_usage', 'N/A'), self.example_style)
+            ])
+
+        vocab_table = Table(vocab_data, colWidths=[1.2*inch, 2.8*inch, 2.8*inch])
+        vocab_table.setStyle(self.vocab_table_style)
+
+        content.append(vocab_table)
+        content.append(Spacer(1, 12))
+
+        # Critical Thinking Questions
+        content.append(self.static("questions_heading"))
+        for i, question in enumerate(analysis.get('critical_thinking_questions', []), 1):
+            q_text = question.get('question', 'N/A')
+            q_type = question.get('question_type', 'N/A')
+            content.append(Paragraph(f"{i}. {q_text} <i>({q_type})</i>", self.bullet_style))
+        content.append(Spacer(1, 12))
+
+        # Key Takeaway
+        content.append(self.static("takeaway_heading"))
+        content.append(Paragraph(analysis.get('takeaway', 'Not available'), self.body_style))
+        content.append(Spacer(1, 20))
+        return content
+
+    def build_story(self, results, streaming: bool = True) -> list:
+        """
+        All flowables for a report. With `streaming` each article is an ArticleSection placeholder
+        that ReportDocTemplate expands on demand; otherwise every article is expanded up front.
+        """
+        content = self.title_page(results)
+        articles = results["articles_analysis"]
+
+        for idx, article_data in enumerate(articles, 1):
+            section = ArticleSection(self, idx, article_data)
+            if streaming:
+                content.append(section)
+            else:
+                content.extend(section.expand())
+
+            # Add page break except for the last article
+            if idx < len(articles):
+                content.append(PageBreak())
+
+        return content
+
+    @staticmethod
+    def document(filepath: str) -> ReportDocTemplate:
+        """Page layout shared by every report"""
+        return ReportDocTemplate(filepath, pagesize=A4,
+                                 rightMargin=72, leftMargin=72,
+                                 topMargin=72, bottomMargin=18,
+                                 pageCompression=1)
+
+    def render(self, results, filepath: str, streaming: bool = True) -> str:
+        """Render a report to `filepath`, one article section at a time unless `streaming` is off"""
+        doc = self.document(filepath)
+        with METRICS.timer("pdf_build_seconds"):
+            doc.build(self.build_story(results, streaming=streaming))
+        METRICS.inc("pdf_reports_total")
+        METRICS.inc("pdf_bytes_total", os.path.getsize(filepath))
+        return filepath
+
+
+_template = None
+
+
+def get_report_template() -> ReportTemplate:
+    """Process-wide ReportTemplate, created on first use"""
+    global _template
+    if _template is None:
+        _template = ReportTemplate()
+    return _template
+
+
+def _render_job(job):
+    """Worker entry point: render one (results, filepath) job with the worker's template"""
+    results, filepath = job
+    try:
+        return get_report_template().render(results, filepath)
+    except Exception as e:
+        print(f"Error creating PDF {filepath}: {e}")
+        return None
+
+
+def render_reports(jobs, max_workers: int = None) -> list:
+    """
+    Render many reports in parallel, one report per worker process
+
+    Args:
+        jobs: Iterable of (results, filepath) pairs
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        list: File path (or None on failure) for each job, in input order
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1 or max_workers == 1:
+        return [_render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=1))
+
+
+def sample_results(num_articles: int = 5, paragraphs: int = 12) -> dict:
+    """Synthetic analysis results for benchmarking the renderer"""
+    analysis = {
+        "central_idea": "The editorial argues that policy reform must balance growth with equity. " * 3,
+        "tone_of_author": "analytical",
+        "paragraph_wise_summary": [f"Paragraph {i} develops the argument further." for i in range(1, paragraphs + 1)],
+        "vocabulary_builder": [
+            {"word": f"word{i}", "meaning": "a moderately difficult meaning", "example_usage": "An example sentence."}
+            for i in range(8)
+        ],
+        "critical_thinking_questions": [
+            {"question": "What does the author assume?", "question_type": "assumptions"} for _ in range(4)
+        ],
+        "takeaway": "Watch how the argument pivots on evidence."
+    }
+
+    return {
+        "session_info": {
+            "timestamp": datetime.now().isoformat(),
+            "total_articles": num_articles,
+            "analysis_status": "completed"
+        },
+        "articles_analysis": [
+            {
+                "article_info": {"number": i, "title": f"Editorial {i}", "url": "https://www.thehindu.com/", "status": "success"},
+                "original_content": "\n".join("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6 for _ in range(paragraphs)),
+                "gemini_analysis": analysis
+            }
+            for i in range(1, num_articles + 1)
+        ]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-report PDF render time")
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Also time a process pool of this size")
+    args = parser.parse_args()
+
+    results = sample_results(args.articles)
+    out_dir = tempfile.mkdtemp()
+    get_report_template()  # warm up fonts and the shared template
+
+    def bench(make_template):
+        story_seconds = 0.0
+        started = time.perf_counter()
+        for i in range(args.reports):
+            story_started = time.perf_counter()
+            story = make_template().build_story(results)
+            story_seconds += time.perf_counter() - story_started
+            ReportTemplate.document(os.path.join(out_dir, f"report_{i}.pdf")).build(story)
+        total = (time.perf_counter() - started) / args.reports * 1000
+        return story_seconds / args.reports * 1000, total
+
+    for label, make_template in (("Fresh template per report", ReportTemplate), ("Shared template", get_report_template)):
+        story_ms, total_ms = bench(make_template)
+        print(f"{label:<27} setup+story {story_ms:6.2f} ms   total {total_ms:7.1f} ms/report")
+
+    if args.workers:
+        jobs = [(results, os.path.join(out_dir, f"pool_{i}.pdf")) for i in range(args.reports)]
+        for label, workers in (("Serial", 1), (f"Process pool ({args.workers} workers)", args.workers)):
+            started = time.perf_counter()
+            render_reports(jobs, max_workers=workers)
+            print(f"{label:<27} {args.reports} reports in {time.perf_counter() - started:.2f}s")
@@ -1,118 +1,353 @@
 import requests
-from bs4 import BeautifulSoup
-import re
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 from datetime import datetime
-import time
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.rate_limit import TokenBucket
+from utils.resilience import CircuitOpenError, DeadlineExceeded, call_with_resilience, get_breaker
+from utils.metrics import METRICS
+from scripts.sources import SOURCES, THE_HINDU, Source
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+
+class ArticleStrainer(SoupStrainer):
+    """Keep only the nodes read by get_article_title and get_article_content"""
+
+    def __init__(self, source: Source):
+        super().__init__()
+        self.source = source
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        if name == 'h1':
+            return True
+        if name == 'meta':
+            return attrs.get('property') == 'og:title'
+        return self.source.is_content_node(name, attrs)
+
+
+# Only the subtrees each extractor reads are built when parsing with these
+LINKS_STRAINER = SoupStrainer('a', href=True)
+ARTICLE_STRAINERS = {source: ArticleStrainer(source) for source in SOURCES.values()}
+
+
+def article_strainer(source: Source) -> ArticleStrainer:
+    """The (shared) article strainer of a source adapter"""
+    if source not in ARTICLE_STRAINERS:
+        ARTICLE_STRAINERS[source] = ArticleStrainer(source)
+    return ARTICLE_STRAINERS[source]
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session whose connection pool can serve `pool_size` threads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def is_editorial_link(href: str) -> bool:
+    """True if `href` points at an individual editorial article of The Hindu"""
+    return THE_HINDU.is_article_link(href)
+
 
 class Scrapper:
-    def __init__(self, url: str):
-        """Initialize scrapper with The Hindu URL"""
-        try:
-            response = requests.get(url)
+    def __init__(self, url: str, session: requests.Session = None, timeout: float = 30, index=None,
+                 parser: str = DEFAULT_PARSER, deadline=None, source: Source = THE_HINDU):
+        """Initialize scrapper with a listing or article URL
+
+        Args:
+            url: Page to fetch
+            session: Shared pooled session; a new one is created if not given
+            timeout: Request timeout in seconds
+            index: Optional ScrapeIndex enabling conditional requests and reuse of
+                previously extracted title/content/links (incremental mode)
+            parser: BeautifulSoup tree builder; lxml is used when installed
+            deadline: Optional resilience Deadline bounding retries of this fetch
+            source: Site adapter with the link and content extraction rules (see scripts/sources.py)
+        """
+        self.url = url
+        self.source = source
+        self.session = session if session else create_session()
+        self.timeout = timeout
+        self.index = index
+        self.cached = index.get(url) if index else None
+        self.not_modified = False
+        self.parser = parser
+        self.deadline = deadline
+        self.error = None
+        self._soups = {}
+
+        self._fetch(conditional=True)
+
+    def _fetch(self, conditional: bool = True):
+        """Download the page, sending stored validators when `conditional` is set"""
+        headers = {}
+        if conditional and self.cached:
+            if self.cached["etag"]:
+                headers["If-None-Match"] = self.cached["etag"]
+            if self.cached["last_modified"]:
+                headers["If-Modified-Since"] = self.cached["last_modified"]
+
+        def get():
+            response = self.session.get(self.url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
-        except requests.exceptions.RequestException as e:
+            return response
+
+        try:
+            # Transient failures (429/5xx, timeouts) are retried with backoff per host
+            with METRICS.timer("http_fetch_seconds"):
+                response = call_with_resilience(
+                    get,
+                    breaker=get_breaker(f"http:{urlparse(self.url).netloc}"),
+                    deadline=self.deadline
+                )
+        except (requests.exceptions.RequestException, CircuitOpenError, DeadlineExceeded) as e:
+            METRICS.inc("http_errors_total")
             print(f"Error fetching URL: {e}")
+            self.error = str(e)
             self.text = None
             return
 
+        if response.status_code == 304:
+            METRICS.inc("http_not_modified_total")
+            self.not_modified = True
+            self.text = None
+            return
+
+        self.not_modified = False
+        self.error = None
         self.text = response.text
-        self.soup = BeautifulSoup(self.text, 'html.parser')
+        self._soups = {}
+        METRICS.inc("http_bytes_total", len(response.content))
+
+        if self.index:
+            # Page changed: drop what was extracted from the previous version
+            self.index.update(
+                self.url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                title=None,
+                content=None,
+                links=None
+            )
+
+    def _parse(self, strainer: SoupStrainer = None) -> BeautifulSoup:
+        """Parse the page once per strainer, building only the nodes it matches"""
+        if strainer not in self._soups:
+            with METRICS.timer("html_parse_seconds"):
+                self._soups[strainer] = BeautifulSoup(self.text, self.parser, parse_only=strainer)
+        return self._soups[strainer]
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Full document tree, parsed on first access"""
+        return self._parse()
+
+    def _cached_field(self, field: str):
+        """Return a stored field after a 304, refetching the page if it was never stored"""
+        if not self.not_modified:
+            return None
+
+        value = self.cached.get(field)
+        if value is None:
+            self._fetch(conditional=False)
+        return value
 
     def get_editorial_links(self, num_articles: int = 1):
         """Find editorial links on the page"""
+        cached_links = self._cached_field("links")
+        if cached_links is not None:
+            return cached_links[:num_articles]
+
         if not self.text:
             return []
 
         editorial_links = []
         seen_links = set()
 
-        # Find editorial links - look for links with strong tags and specific patterns
-        for link in self.soup.find_all('a', href=True):
-            href = link['href']
-            
-            if ('opinion/editorial/' in href and 
-                href != 'https://www.thehindu.com/opinion/editorial/' and
-                '/article' in href and 
-                link.find('strong')):  
-                
-                # Make sure it's a full URL
-                if not href.startswith('http'):
-                    href = 'https://www.thehindu.com' + href
-                
+        # Find editorial links - article URLs, wrapping the source's teaser markup if it has any
+        for link in self._parse(LINKS_STRAINER).find_all('a', href=True):
+            href = self.source.absolute(link['href'])
+
+            teaser = self.source.teaser_tag
+            if self.source.is_article_link(href) and (not teaser or link.find(teaser)):
                 if href not in seen_links:
                     seen_links.add(href)
                     editorial_links.append(href)
-                    if len(editorial_links) >= num_articles:
+                    # The index keeps every link so later runs can ask for more
+                    if not self.index and len(editorial_links) >= num_articles:
                         break
 
+        if self.index:
+            self.index.update(self.url, links=editorial_links)
+
         return editorial_links[:num_articles]
 
+    def get_archive_links(self):
+        """Find every editorial link on an archive day page (no teaser markup there)"""
+        if not self.text:
+            return []
+
+        editorial_links = []
+        seen_links = set()
+
+        for link in self._parse(LINKS_STRAINER).find_all('a', href=True):
+            href = self.source.absolute(link['href'])
+
+            if self.source.is_article_link(href):
+                if href not in seen_links:
+                    seen_links.add(href)
+                    editorial_links.append(href)
+
+        return editorial_links
+
     def get_article_title(self):
         """Extract article title"""
+        cached_title = self._cached_field("title")
+        if cached_title is not None:
+            return cached_title
+
         if not self.text:
             return "Title not found"
         
-        title_tag = self.soup.find('h1')
+        soup = self._parse(article_strainer(self.source))
+        title = None
+        title_tag = soup.find('h1')
         if title_tag:
-            return title_tag.get_text().strip()
-        
-        meta_title = self.soup.find('meta', property='og:title')
-        if meta_title and meta_title.get('content'):
-            return meta_title.get('content').strip()
-        
-        return "Title not found"
+            title = title_tag.get_text().strip()
+        else:
+            meta_title = soup.find('meta', property='og:title')
+            if meta_title and meta_title.get('content'):
+                title = meta_title.get('content').strip()
 
+        if title is None:
+            return "Title not found"
+
+        if self.index:
+            self.index.update(self.url, title=title)
+        return title
+
+    @METRICS.timer("content_extract_seconds")
     def get_article_content(self):
         """Extract clean article content, filtering out metadata and related topics"""
+        cached_content = self._cached_field("content")
+        if cached_content is not None:
+            return cached_content
+
         if not self.text:
             return "Article content not found."
 
         # Find main content div
-        content_div = self.soup.find('div', id=re.compile(r'^content-body-'))
-        
+        content_div = self.source.find_content(self._parse(article_strainer(self.source)))
+
         if not content_div:
             return "Article content could not be extracted."
 
-        # Remove unwanted sections (related topics, metadata, etc.)
-        for unwanted in content_div.find_all(['div', 'section', 'aside'], 
-                                           class_=re.compile(r'(related|topic|tag|category|meta)', re.IGNORECASE)):
-            unwanted.decompose()
-        
-        # Find all paragraphs and filter them
-        paragraphs = content_div.find_all('p')
-        filtered_paragraphs = []
-        
-        for p in paragraphs:
-            text = p.get_text().strip()
-            
-            # Skip empty paragraphs
-            if not text:
-                continue
-            
-            # Skip category/tag lists (multiple forward slashes)
-            if text.count('/') > 2:
-                continue
-            
-            # Skip paragraphs with too many links (likely metadata)
-            links = p.find_all('a')
-            if links and len(links) > 2:
-                link_text_length = sum(len(a.get_text().strip()) for a in links)
-                total_text_length = len(text)
-                
-                if total_text_length > 0 and (link_text_length / total_text_length) > 0.7:
-                    continue
-            
-            filtered_paragraphs.append(text)
-        
-        return '\n'.join(filtered_paragraphs)
+        content = '\n'.join(self.source.extract_paragraphs(content_div))
+        if self.index:
+            self.index.update(self.url, content=content)
+        return content
     
 
-    def scrape_articles(self, num_articles: int = 1) -> str:
-        
+    def _scrape_article(self, idx: int, link: str, limiter: TokenBucket) -> dict:
+        """Fetch a single article through the shared session, or reuse it from the index"""
+        if self.index:
+            entry = self.index.get(link)
+            if entry and entry["title"] is not None and entry["content"] is not None:
+                return {
+                    'article_number': idx,
+                    'url': link,
+                    'title': entry["title"],
+                    'content': entry["content"],
+                    'status': 'success',
+                    'from_index': True
+                }
+
+        limiter.acquire()
+
+        try:
+            article_scrapper = Scrapper(link, session=self.session, timeout=self.timeout, index=self.index,
+                                        parser=self.parser, deadline=self.deadline, source=self.source)
+            if article_scrapper.error:
+                raise RuntimeError(article_scrapper.error)
+
+            return {
+                'article_number': idx,
+                'url': link,
+                'title': article_scrapper.get_article_title(),
+                'content': article_scrapper.get_article_content(),
+                'status': 'success',
+                'from_index': False
+            }
+
+        except Exception as e:
+            return {
+                'article_number': idx,
+                'url': link,
+                'title': 'Error occurred',
+                'content': f'Failed to scrape article: {str(e)}',
+                'status': 'error',
+                'from_index': False
+            }
+
+    def iter_articles(self, num_articles: int = 1, max_concurrency: int = 4,
+                      requests_per_second: float = 2.0, burst: int = None):
+        """
+        Scrape editorial articles concurrently, yielding each record as soon as it is ready.
+        Records arrive in completion order; use `article_number` to restore index order.
+
+        Args:
+            num_articles: Number of editorials to scrape
+            max_concurrency: Maximum number of article requests in flight
+            requests_per_second: Politeness limit for starting new requests (<= 0 disables it)
+            burst: Requests allowed to start back-to-back (defaults to max_concurrency)
+        """
         editorial_links = self.get_editorial_links(num_articles=num_articles)
-        
+
         if not editorial_links:
+            return
+
+        limiter = TokenBucket(rate=requests_per_second, capacity=burst or max_concurrency)
+        workers = max(1, min(max_concurrency, len(editorial_links)))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._scrape_article, idx, link, limiter)
+                for idx, link in enumerate(editorial_links, 1)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def scrape_articles(self, num_articles: int = 1, max_concurrency: int = 4,
+                        requests_per_second: float = 2.0, burst: int = None) -> str:
+        """
+        Scrape editorial articles concurrently over the shared keep-alive session.
+        When the scrapper has an index, articles already in it are not refetched.
+
+        Args:
+            num_articles: Number of editorials to scrape
+            max_concurrency: Maximum number of article requests in flight
+            requests_per_second: Politeness limit for starting new requests (<= 0 disables it)
+            burst: Requests allowed to start back-to-back (defaults to max_concurrency)
+
+        Returns:
+            str: JSON document with the scraped articles in index order
+        """
+        articles_data = sorted(
+            self.iter_articles(num_articles, max_concurrency, requests_per_second, burst),
+            key=lambda article: article['article_number']
+        )
+        
+        if not articles_data:
             return json.dumps({
                 'status': 'error',
                 'message': 'No editorial links found',
@@ -120,35 +355,6 @@ class Scrapper:
                 'scraped_at': datetime.now().isoformat()
             }, indent=2, ensure_ascii=False)
         
-        articles_data = []
-        
-        for idx, link in enumerate(editorial_links, 1):
-            try:
-                # Create new scrapper instance for each article
-                article_scrapper = Scrapper(link)
-                
-                article_data = {
-                    'article_number': idx,
-                    'url': link,
-                    'title': article_scrapper.get_article_title(),
-                    'content': article_scrapper.get_article_content(),
-                    'status': 'success'
-                }
-                
-                articles_data.append(article_data)
-                
-                
-                time.sleep(0.5)
-                
-            except Exception as e:
-                articles_data.append({
-                    'article_number': idx,
-                    'url': link,
-                    'title': 'Error occurred',
-                    'content': f'Failed to scrape article: {str(e)}',
-                    'status': 'error'
-                })
-        
         result = {
             'status': 'success',
             'total_articles': len(articles_data),
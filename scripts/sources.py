@@ -0,0 +1,156 @@
+import re
+from urllib.parse import urljoin, urlparse
+
+# Sections inside an article body that aren't part of the editorial
+UNWANTED_SECTIONS = re.compile(r'(related|topic|tag|category|meta)', re.IGNORECASE)
+
+
+class Source:
+    """
+    Link discovery and content extraction rules for one newspaper's editorial section.
+    Subclasses set the class attributes and override methods only where the site differs.
+    """
+    name = None
+    index_url = None          # editorial listing page
+    base_url = None           # prefix for relative links
+    link_pattern = None       # regex an (absolute) article URL must match
+    teaser_tag = None         # on the listing page, only links wrapping this tag are articles
+    content_tag = "div"       # article body container...
+    content_id = None         # ...matched by id
+    content_class = None      # ...or by class
+
+    @property
+    def domain(self) -> str:
+        return urlparse(self.base_url).netloc
+
+    def is_article_link(self, href: str) -> bool:
+        return bool(self.link_pattern.search(href)) and href.rstrip("/") != self.index_url.rstrip("/")
+
+    def absolute(self, href: str) -> str:
+        return href if href.startswith("http") else urljoin(self.base_url, href)
+
+    def is_content_node(self, name: str, attrs: dict) -> bool:
+        """True for the article body container (also used while parsing, before the tree exists)"""
+        if name != self.content_tag:
+            return False
+        if self.content_id and self.content_id.search(attrs.get("id") or ""):
+            return True
+        if self.content_class:
+            classes = attrs.get("class") or ""
+            classes = " ".join(classes) if isinstance(classes, list) else classes
+            return bool(self.content_class.search(classes))
+        return False
+
+    def find_content(self, soup):
+        return soup.find(lambda tag: self.is_content_node(tag.name, tag.attrs))
+
+    def extract_paragraphs(self, container) -> list:
+        """Editorial paragraphs of the body container, filtering out metadata and related topics"""
+        for unwanted in container.find_all(['div', 'section', 'aside'], class_=UNWANTED_SECTIONS):
+            unwanted.decompose()
+
+        paragraphs = []
+        for p in container.find_all('p'):
+            # html.parser nests the paragraphs that follow an unclosed <p> inside it (lxml closes it),
+            # so only the strings and links that belong to this paragraph itself are read
+            text = "".join(s for s in p.strings if s.find_parent('p') is p).strip()
+
+            # Skip empty paragraphs
+            if not text:
+                continue
+
+            # Skip category/tag lists (multiple forward slashes)
+            if text.count('/') > 2:
+                continue
+
+            # Skip paragraphs with too many links (likely metadata)
+            links = [a for a in p.find_all('a') if a.find_parent('p') is p]
+            if links and len(links) > 2:
+                link_text_length = sum(len(a.get_text().strip()) for a in links)
+                if (link_text_length / len(text)) > 0.7:
+                    continue
+
+            paragraphs.append(text)
+
+        return paragraphs
+
+
+class TheHindu(Source):
+    name = "the_hindu"
+    index_url = "https://www.thehindu.com/opinion/editorial/"
+    base_url = "https://www.thehindu.com"
+    teaser_tag = "strong"
+    content_id = re.compile(r'^content-body-')
+
+    def is_article_link(self, href: str) -> bool:
+        # Path-based so archive pages and local fixture servers match too
+        return 'opinion/editorial/' in href and href != self.index_url and '/article' in href
+
+
+class IndianExpress(Source):
+    name = "indian_express"
+    index_url = "https://indianexpress.com/section/opinion/editorials/"
+    base_url = "https://indianexpress.com"
+    link_pattern = re.compile(r'indianexpress\.com/article/opinion/editorials/[^/]+-\d+/?$')
+    content_id = re.compile(r'^pcl-full-content$')
+    content_class = re.compile(r'\bfull-details\b')
+
+
+class Mint(Source):
+    name = "mint"
+    index_url = "https://www.livemint.com/opinion/quick-edit"
+    base_url = "https://www.livemint.com"
+    link_pattern = re.compile(r'livemint\.com/opinion/quick-edit/[^/]+-\d+\.html$')
+    content_id = re.compile(r'^mainArea$')
+    content_class = re.compile(r'\bstoryParagraph\b')
+
+
+class EconomicTimes(Source):
+    name = "economic_times"
+    index_url = "https://economictimes.indiatimes.com/opinion/et-editorial"
+    base_url = "https://economictimes.indiatimes.com"
+    link_pattern = re.compile(r'economictimes\.indiatimes\.com/opinion/et-editorial/[^/]+/articleshow/\d+\.cms')
+    content_class = re.compile(r'\bartText\b')
+
+    def extract_paragraphs(self, container) -> list:
+        # ET separates paragraphs with <br> rather than wrapping them in <p>
+        paragraphs = super().extract_paragraphs(container)
+        if paragraphs:
+            return paragraphs
+        return [line.strip() for line in container.get_text("\n").splitlines() if line.strip()]
+
+
+THE_HINDU = TheHindu()
+SOURCES = {source.name: source for source in (THE_HINDU, IndianExpress(), Mint(), EconomicTimes())}
+
+
+def get_source(name: str) -> Source:
+    if name not in SOURCES:
+        raise ValueError(f"Unknown source {name!r}; expected one of {', '.join(SOURCES)}")
+    return SOURCES[name]
+
+
+def _serves(source: Source, host: str) -> bool:
+    return host == source.domain or host.endswith("." + source.domain.removeprefix("www."))
+
+
+def source_for_url(url: str) -> Source:
+    """Adapter for the site serving `url`; The Hindu's for anything unrecognized"""
+    host = urlparse(url).hostname or ""
+    for source in SOURCES.values():
+        if _serves(source, host):
+            return source
+    return THE_HINDU
+
+
+def is_source_url(url: str) -> bool:
+    """True for a plain https URL on one of the known newspapers' sites, the only pages the API will fetch"""
+    try:
+        parsed = urlparse(url)
+        port = parsed.port
+    except ValueError:
+        return False
+
+    if parsed.scheme != "https" or not parsed.hostname or parsed.username or parsed.password or port not in (None, 443):
+        return False
+    return any(_serves(source, parsed.hostname) for source in SOURCES.values())
@@ -0,0 +1,89 @@
+"""
+Backfill against the local fixture server and the fake Gemini client: a run over two archive days,
+then a resumed run once a failed article can be fetched again.
+
+    python -m unittest tests.test_backfill
+"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from benchmarks.fixtures import FakeGeminiClient, FixtureServer
+from scripts.backfill import Backfill
+from scripts.gemini import Gemini
+
+# Editorial 3 is listed on both days and must only be analyzed once
+ARCHIVE = {"2025/03/01": [1, 2, 3], "2025/03/02": [3, 4]}
+
+
+class CountingClient(FakeGeminiClient):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        return super().generate_content(model, contents, config)
+
+
+class BackfillTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.server = FixtureServer(paragraphs=3, archive=ARCHIVE).__enter__()
+        self.client = CountingClient()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        shutil.rmtree(self.output_dir)
+
+    def backfill(self) -> Backfill:
+        return Backfill(Gemini(client=self.client), start_date=date(2025, 3, 1), end_date=date(2025, 3, 2),
+                        output_dir=self.output_dir, archive_url=self.server.archive_url,
+                        link_prefix=self.server.base_url, max_concurrency=2,
+                        requests_per_second=1000, requests_per_minute=60000)
+
+    def url(self, number: int) -> str:
+        return f"{self.server.base_url}/opinion/editorial/editorial-{number}/article{number}.ece"
+
+    def checkpoint(self) -> dict:
+        with open(os.path.join(self.output_dir, "checkpoint.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def analyzed_urls(self) -> list:
+        with open(os.path.join(self.output_dir, "analyses.jsonl"), encoding="utf-8") as f:
+            return [json.loads(line)["article_info"]["url"] for line in f]
+
+    def test_resume_dedupe_and_retry(self):
+        self.server.missing.add(2)
+
+        summary = self.backfill().run()
+        self.assertEqual(summary, {"days": 2, "analyzed": 3, "skipped": 1, "failed": 1})
+        self.assertEqual(self.client.calls, 3)
+        self.assertEqual(sorted(self.analyzed_urls()), [self.url(1), self.url(3), self.url(4)])
+
+        checkpoint = self.checkpoint()
+        # The day with a failure stays open so its failed article is retried
+        self.assertEqual(checkpoint["completed_days"], ["2025-03-02"])
+        self.assertEqual(list(checkpoint["failed_urls"]), [self.url(2)])
+
+        # Resuming from the checkpoint only fetches and analyzes the failed article
+        self.server.missing.clear()
+        summary = self.backfill().run()
+        self.assertEqual(summary, {"days": 1, "analyzed": 1, "skipped": 2, "failed": 0})
+        self.assertEqual(self.client.calls, 4)
+        self.assertEqual(sorted(self.analyzed_urls()), [self.url(n) for n in (1, 2, 3, 4)])
+
+        checkpoint = self.checkpoint()
+        self.assertEqual(checkpoint["completed_days"], ["2025-03-01", "2025-03-02"])
+        self.assertEqual(checkpoint["failed_urls"], {})
+
+        # Everything is done: nothing is fetched or analyzed again
+        self.assertEqual(self.backfill().run(), {"days": 0, "analyzed": 0, "skipped": 0, "failed": 0})
+        self.assertEqual(self.client.calls, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Golden test for article extraction: every saved page is parsed with lxml and html.parser, with and
+without the strainers, and the title, content and links must match tests/fixtures/extraction_golden.json.
+
+    python -m unittest tests.test_extraction_golden
+    python -m tests.test_extraction_golden --update    # rewrite the golden file after a reviewed change
+"""
+import os
+import sys
+import json
+import unittest
+from types import SimpleNamespace
+
+from scripts.scrapper import Scrapper
+from scripts.sources import SOURCES
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGES_DIR = os.path.join(FIXTURES, "pages")
+GOLDEN_PATH = os.path.join(FIXTURES, "extraction_golden.json")
+PARSERS = ("lxml", "html.parser")
+
+# Saved page -> (source, URL it was served from)
+PAGES = {
+    "the_hindu_article.html": ("the_hindu", "https://www.thehindu.com/opinion/editorial/reform-without-consultation/article69287314.ece"),
+    "the_hindu_index.html": ("the_hindu", "https://www.thehindu.com/opinion/editorial/"),
+    "indian_express_article.html": ("indian_express", "https://indianexpress.com/article/opinion/editorials/express-view-on-the-fiscal-deficit-9870031/"),
+    "indian_express_index.html": ("indian_express", "https://indianexpress.com/section/opinion/editorials/"),
+    "mint_article.html": ("mint", "https://www.livemint.com/opinion/quick-edit/rate-cuts-are-not-a-cure-all-11740000000000.html"),
+    "economic_times_article.html": ("economic_times", "https://economictimes.indiatimes.com/opinion/et-editorial/keep-the-reform-momentum/articleshow/118700000.cms"),
+}
+
+
+class PageSession:
+    """Stands in for requests.Session, answering every GET with one saved page"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def get(self, url, headers=None, timeout=None):
+        return SimpleNamespace(status_code=200, text=self.text, content=self.text.encode(), headers={},
+                               raise_for_status=lambda: None)
+
+
+def extract(page: str, parser: str, strained: bool = True) -> dict:
+    """Title, content and links of a saved page, as the scraper extracts them"""
+    source_name, url = PAGES[page]
+    with open(os.path.join(PAGES_DIR, page), encoding="utf-8") as f:
+        scraper = Scrapper(url, session=PageSession(f.read()), parser=parser, source=SOURCES[source_name])
+
+    if not strained:
+        # Every extractor reads the full tree instead of its strained subset
+        scraper._parse = lambda strainer=None: Scrapper._parse(scraper)
+
+    return {
+        "title": scraper.get_article_title(),
+        "content": scraper.get_article_content(),
+        "links": scraper.get_editorial_links(num_articles=100),
+    }
+
+
+def load_golden() -> dict:
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ExtractionGoldenTest(unittest.TestCase):
+    def test_pages_match_golden(self):
+        golden = load_golden()
+        self.assertEqual(sorted(golden), sorted(PAGES))
+
+        for page in PAGES:
+            for parser in PARSERS:
+                for strained in (True, False):
+                    with self.subTest(page=page, parser=parser, strained=strained):
+                        self.assertEqual(extract(page, parser, strained), golden[page])
+
+
+if __name__ == "__main__":
+    if "--update" in sys.argv:
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump({page: extract(page, "html.parser") for page in PAGES}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"✅ Wrote {GOLDEN_PATH}")
+    else:
+        unittest.main()
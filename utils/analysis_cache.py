@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from utils.metrics import METRICS
+from utils.db import connect
+
+
+def make_cache_key(*parts) -> str:
+    """Build a content-addressed key from JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Persistent SQLite cache for Gemini analyses with TTL and LRU eviction"""
+
+    def __init__(self, path: str = ".cache/analysis_cache.sqlite", ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 5000, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Entries older than this are treated as misses (<= 0 disables expiry)
+            max_entries: Maximum number of cached analyses
+            max_bytes: Maximum total size of cached payloads
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses(accessed_at)")
+
+    def _connect(self):
+        return connect(self.path)
+
+    def get(self, key: str):
+        """Return the cached analysis for `key`, or None on a miss"""
+        now = time.time()
+
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+
+            if row and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                row = None
+
+            if not row:
+                self.misses += 1
+                METRICS.inc("analysis_cache_misses_total")
+                return None
+
+            conn.execute("UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            METRICS.inc("analysis_cache_hits_total")
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value):
+        """Store an analysis and evict old entries if the cache is over its limits"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then least recently used ones until under the caps"""
+        if self.ttl_seconds > 0:
+            conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        for key, size in conn.execute("SELECT key, size FROM analyses ORDER BY accessed_at ASC").fetchall():
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+            count -= 1
+            total_bytes -= size
+
+    def clear(self):
+        """Remove every cached analysis"""
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM analyses")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current cache size"""
+        with self.lock, self._connect() as conn:
+            count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": count,
+                "bytes": total_bytes
+            }
@@ -0,0 +1,16 @@
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def connect(path: str, **kwargs):
+    """
+    SQLite connection for one operation: committed (rolled back on error) and closed when the
+    block exits. `with sqlite3.connect(...)` alone only ends the transaction and leaks the connection.
+    """
+    conn = sqlite3.connect(path, timeout=30, **kwargs)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
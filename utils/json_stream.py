@@ -0,0 +1,171 @@
+import json
+
+WHITESPACE = " \t\r\n"
+LITERAL_CHARS = set("0123456789+-.eEtrufalsn")
+
+
+class MalformedJSON(ValueError):
+    """Raised as soon as the streamed text can no longer be valid JSON"""
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object that reports each completed field as
+    soon as its closing character arrives: top-level values (e.g. "central_idea") and the
+    individual elements of top-level arrays (e.g. each "vocabulary_builder" entry).
+
+    feed() returns a list of (field, index, value) tuples, index being None for top-level
+    values; structural errors raise MalformedJSON immediately rather than at the end.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.position = 0
+        self.stack = []          # frames: {"type": "object"|"array", "expect": ..., "key": ..., "index": ...}
+        self.root_started = False
+        self.done = False
+        self.in_string = False
+        self.escaped = False
+        self.string_is_key = False
+        self.in_literal = False
+        self.value_starts = {}   # depth -> start offset of the value being tracked at that depth
+        self.result = None
+
+    def feed(self, chunk: str) -> list:
+        self.text += chunk
+        events = []
+
+        while self.position < len(self.text):
+            char = self.text[self.position]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.string_is_key:
+                        self._key_done()
+                    else:
+                        self._value_done(self.position + 1, events)
+                self.position += 1
+                continue
+
+            if self.in_literal:
+                if char in LITERAL_CHARS:
+                    self.position += 1
+                    continue
+                # The delimiter ends the literal and is then processed normally
+                self.in_literal = False
+                self._value_done(self.position, events)
+
+            self._structural(char, events)
+            self.position += 1
+
+        return events
+
+    def close(self):
+        """Finish the stream; returns the parsed object or raises MalformedJSON if it is incomplete"""
+        if self.in_literal and not self.stack:
+            self.in_literal = False
+            self._value_done(len(self.text), [])
+        if not self.done:
+            raise MalformedJSON("Stream ended before the JSON object was complete")
+        return self.result
+
+    def _structural(self, char: str, events: list):
+        if char in WHITESPACE:
+            return
+
+        if self.done:
+            raise MalformedJSON(f"Unexpected {char!r} after the end of the JSON object")
+
+        frame = self.stack[-1] if self.stack else None
+        expect = frame["expect"] if frame else ("value" if not self.root_started else None)
+
+        if expect == "value":
+            self._value_start(char)
+        elif expect == "key":
+            if char == '"':
+                self.in_string, self.string_is_key = True, True
+                self.value_starts["key"] = self.position
+            elif char == "}" and frame["key"] is None:
+                self._close(frame, events)
+            else:
+                raise MalformedJSON(f"Expected a key at offset {self.position}, got {char!r}")
+        elif expect == "colon":
+            if char != ":":
+                raise MalformedJSON(f"Expected ':' at offset {self.position}, got {char!r}")
+            frame["expect"] = "value"
+        elif expect == "comma":
+            if char == ",":
+                frame["expect"] = "key" if frame["type"] == "object" else "value"
+            elif char == ("}" if frame["type"] == "object" else "]"):
+                self._close(frame, events)
+            else:
+                raise MalformedJSON(f"Expected ',' at offset {self.position}, got {char!r}")
+        else:
+            raise MalformedJSON(f"Unexpected {char!r} at offset {self.position}")
+
+    def _value_start(self, char: str):
+        frame = self.stack[-1] if self.stack else None
+        if frame and frame["type"] == "array" and char == "]" and frame["index"] == 0:
+            self._close(frame, [])
+            return
+
+        self.root_started = True
+        self.value_starts[len(self.stack)] = self.position
+
+        if char == "{":
+            self.stack.append({"type": "object", "expect": "key", "key": None, "index": 0})
+        elif char == "[":
+            self.stack.append({"type": "array", "expect": "value", "key": None, "index": 0})
+        elif char == '"':
+            self.in_string, self.string_is_key = True, False
+        elif char in LITERAL_CHARS:
+            self.in_literal = True
+        else:
+            raise MalformedJSON(f"Unexpected {char!r} at offset {self.position}")
+
+    def _key_done(self):
+        frame = self.stack[-1]
+        frame["key"] = json.loads(self.text[self.value_starts.pop("key"):self.position + 1])
+        frame["expect"] = "colon"
+
+    def _close(self, frame: dict, events: list):
+        self.stack.pop()
+        self._value_done(self.position + 1, events)
+
+    def _value_done(self, end: int, events: list):
+        depth = len(self.stack)
+        start = self.value_starts.pop(depth, None)
+
+        if depth == 0:
+            try:
+                self.result = json.loads(self.text[start:end])
+            except json.JSONDecodeError as e:
+                raise MalformedJSON(str(e))
+            self.done = True
+            return
+
+        frame = self.stack[-1]
+        frame["expect"] = "comma"
+
+        field = index = None
+        if depth == 1 and frame["type"] == "object":
+            field = frame["key"]
+        elif depth == 2 and frame["type"] == "array" and self.stack[0]["type"] == "object":
+            field, index = self.stack[0]["key"], frame["index"]
+
+        if frame["type"] == "array":
+            frame["index"] += 1
+
+        if field is not None and start is not None:
+            try:
+                value = json.loads(self.text[start:end])
+            except json.JSONDecodeError as e:
+                raise MalformedJSON(f"Invalid value for {field}: {e}")
+            # Arrays are reported element by element, not again as a whole
+            if not (depth == 1 and isinstance(value, list)):
+                events.append((field, index, value))
@@ -0,0 +1,163 @@
+import time
+import threading
+from contextlib import ContextDecorator
+
+# Histogram bucket upper bounds in seconds (Prometheus defaults plus a few long Gemini calls)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _Timer(ContextDecorator):
+    """Records the elapsed time of a `with` block or decorated function into a histogram"""
+
+    def __init__(self, metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+        # Decorator instances are shared between threads and nested calls
+        self._local = threading.local()
+
+    def __enter__(self):
+        if not hasattr(self._local, "started"):
+            self._local.started = []
+        self._local.started.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self._local.started.pop())
+        return False
+
+
+class Metrics:
+    """Thread-safe, in-process counters and latency histograms for the pipeline stages"""
+
+    def __init__(self, prefix: str = "hindu", buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            prefix: Namespace prepended to every exported Prometheus metric
+            buckets: Histogram bucket upper bounds
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def timer(self, name: str) -> _Timer:
+        """Context manager / decorator timing a stage into the `name` histogram"""
+        return _Timer(self, name)
+
+    def observe(self, name: str, value: float):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = {
+                    "count": 0, "sum": 0.0, "min": None, "max": None, "buckets": [0] * len(self.buckets)
+                }
+
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["min"] = value if histogram["min"] is None else min(histogram["min"], value)
+            histogram["max"] = value if histogram["max"] is None else max(histogram["max"], value)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+
+    def inc(self, name: str, amount: float = 1, labels: dict = None):
+        """Add to a counter; `labels` (e.g. {"source": "mint"}) select one series of the metric"""
+        if labels:
+            name += "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        """Copy of the current values, usable as the `since` baseline of summary()"""
+        with self.lock:
+            return {
+                "histograms": {name: {**h, "buckets": list(h["buckets"])} for name, h in self.histograms.items()},
+                "counters": dict(self.counters)
+            }
+
+    def summary(self, since: dict = None) -> dict:
+        """
+        JSON-friendly summary of stage timings and counters
+
+        Args:
+            since: Optional snapshot(); only activity after it is reported (min/max stay cumulative)
+        """
+        current = self.snapshot()
+        base = since or {"histograms": {}, "counters": {}}
+
+        stages = {}
+        for name, histogram in current["histograms"].items():
+            previous = base["histograms"].get(name, {"count": 0, "sum": 0.0})
+            count = histogram["count"] - previous["count"]
+            total = histogram["sum"] - previous["sum"]
+            if count:
+                stages[name] = {
+                    "count": count,
+                    "total": round(total, 4),
+                    "mean": round(total / count, 4),
+                    "min": round(histogram["min"], 4),
+                    "max": round(histogram["max"], 4)
+                }
+
+        counters = {}
+        for name, value in current["counters"].items():
+            delta = value - base["counters"].get(name, 0)
+            if delta:
+                counters[name] = delta
+
+        hits = counters.get("analysis_cache_hits_total", 0)
+        lookups = hits + counters.get("analysis_cache_misses_total", 0)
+        if lookups:
+            counters["analysis_cache_hit_rate"] = round(hits / lookups, 3)
+
+        return {"stages": stages, "counters": counters}
+
+    def prometheus(self) -> str:
+        """Export everything in the Prometheus text exposition format"""
+        current = self.snapshot()
+        lines = []
+
+        # Labelled series of a counter share one metric, so they are grouped under a single TYPE line
+        typed = None
+        for name, value in sorted(current["counters"].items(), key=lambda item: (item[0].split("{")[0], item[0])):
+            metric = f"{self.prefix}_{name.split('{')[0]}"
+            if metric != typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed = metric
+            lines.append(f"{self.prefix}_{name} {value}")
+
+        for name, histogram in sorted(current["histograms"].items()):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{metric}_sum {histogram['sum']}")
+            lines.append(f"{metric}_count {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+# Process-wide registry shared by the scraper, Gemini client, report builder and mailer
+METRICS = Metrics()
+
+
+def record_gemini_usage(response):
+    """Count prompt/output tokens from a generate_content response's usage metadata"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+
+    for field, name in (("prompt_token_count", "gemini_prompt_tokens_total"),
+                        ("candidates_token_count", "gemini_output_tokens_total"),
+                        ("cached_content_token_count", "gemini_cached_tokens_total"),
+                        ("thoughts_token_count", "gemini_thinking_tokens_total")):
+        value = getattr(usage, field, None)
+        if value:
+            METRICS.inc(name, value)
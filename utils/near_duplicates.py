@@ -0,0 +1,186 @@
+import os
+import re
+import time
+import array
+import hashlib
+import threading
+
+from utils.metrics import METRICS
+from utils.db import connect
+from utils.text_prep import strip_boilerplate
+
+WORD = re.compile(r"\w+")
+SHINGLE_WORDS = 5
+
+# 128 one-permutation MinHash bins, banded 16 x 8 for LSH: pairs at Jaccard 0.7 become candidates
+# about half the time, pairs at 0.9 almost always; candidates are then checked on the full signature
+NUM_BINS = 128
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+EMPTY = (1 << 64) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    url TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band_key INTEGER NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bands_key ON bands(band_key);
+CREATE INDEX IF NOT EXISTS idx_bands_url ON bands(url);
+"""
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def minhash(text: str) -> list:
+    """
+    One-permutation MinHash signature of the text's word 5-gram shingles.
+
+    Each shingle is hashed once; the hash picks a bin and the bin keeps its minimum,
+    so the cost is linear in the article length rather than in length x NUM_BINS.
+    Empty bins borrow from the next non-empty one (rotation densification).
+    """
+    words = WORD.findall(strip_boilerplate(text or "").lower())
+    if not words:
+        return []
+
+    bins = [EMPTY] * NUM_BINS
+    for i in range(max(1, len(words) - SHINGLE_WORDS + 1)):
+        value = _hash64(" ".join(words[i:i + SHINGLE_WORDS]).encode())
+        position, rest = value % NUM_BINS, value // NUM_BINS
+        if rest < bins[position]:
+            bins[position] = rest
+
+    if EMPTY in bins:
+        filled = [position for position, value in enumerate(bins) if value != EMPTY]
+        signature = list(bins)
+        for position in range(NUM_BINS):
+            if bins[position] == EMPTY:
+                distance = min((other - position) % NUM_BINS for other in filled)
+                signature[position] = bins[(position + distance) % NUM_BINS] + distance
+        return signature
+    return bins
+
+
+def similarity(first: list, second: list) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not first or not second:
+        return 0.0
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_BINS
+
+
+def band_keys(signature: list) -> list:
+    """One signed 64-bit LSH key per band (SQLite INTEGER range)"""
+    keys = []
+    for band in range(BANDS):
+        rows = array.array("Q", signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures of analyzed articles, used to reuse the stored analysis of
+    an editorial that was republished or lightly edited under a new URL
+    """
+
+    def __init__(self, store=None, path: str = ".cache/near_duplicates.sqlite", threshold: float = 0.85):
+        """
+        Args:
+            store: ResultsStore holding the analyses to reuse
+            path: SQLite file for signatures and LSH bands
+            threshold: Minimum estimated Jaccard similarity to count as a duplicate
+        """
+        if store is None:
+            from utils.results_store import ResultsStore
+            store = ResultsStore()
+
+        self.store = store
+        self.path = path
+        self.threshold = threshold
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+
+    def add(self, url: str, text: str = None, signature: list = None):
+        """Record the signature of an analyzed article (replacing any earlier one for `url`)"""
+        signature = signature if signature is not None else minhash(text)
+        if not signature:
+            return
+
+        with self.lock, connect(self.path) as conn:
+            conn.execute("DELETE FROM bands WHERE url = ?", (url,))
+            conn.execute(
+                "INSERT OR REPLACE INTO signatures (url, signature, added_at) VALUES (?, ?, ?)",
+                (url, array.array("Q", signature).tobytes(), time.time())
+            )
+            conn.executemany("INSERT INTO bands (band_key, url) VALUES (?, ?)",
+                             [(key, url) for key in band_keys(signature)])
+
+    def find(self, text: str = None, signature: list = None, url: str = None):
+        """
+        Most similar indexed article at or above the threshold, other than `url` itself (an edited
+        article re-analyzed at the same URL must not match its own earlier version)
+
+        Returns:
+            tuple: (url, similarity), or None when there is no near-duplicate
+        """
+        signature = signature if signature is not None else minhash(text)
+        if not signature:
+            return None
+
+        with METRICS.timer("near_duplicate_lookup_seconds"), connect(self.path) as conn:
+            keys = band_keys(signature)
+            candidates = conn.execute(
+                f"""SELECT url, signature FROM signatures WHERE url != ? AND url IN (
+                        SELECT DISTINCT url FROM bands WHERE band_key IN ({', '.join('?' * len(keys))}))""",
+                [url or "", *keys]
+            ).fetchall()
+
+        best = None
+        for url, blob in candidates:
+            score = similarity(signature, array.array("Q", blob).tolist())
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (url, score)
+        return best
+
+    def reuse(self, text: str, url: str = None):
+        """
+        Stored analysis of a near-duplicate of `text`, published at another URL than `url`
+
+        Returns:
+            tuple: (analysis, url, similarity), or None when there is nothing to reuse
+        """
+        match = self.find(text, url=url)
+        if not match:
+            METRICS.inc("near_duplicate_misses_total")
+            return None
+
+        analysis = self.store.get_analysis(match[0])
+        if not analysis:
+            METRICS.inc("near_duplicate_misses_total")
+            return None
+
+        METRICS.inc("near_duplicate_hits_total")
+        return analysis, match[0], round(match[1], 3)
+
+    def record(self, results):
+        """Add signatures for the freshly analyzed (not reused) articles of a main()/analyze_url() result"""
+        for entry in results["articles_analysis"]:
+            if entry["gemini_analysis"] and not entry["article_info"].get("duplicate_of"):
+                self.add(entry["article_info"]["url"], entry["original_content"])
+
+    def stats(self) -> dict:
+        with connect(self.path) as conn:
+            return {"signatures": conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]}
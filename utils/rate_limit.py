@@ -0,0 +1,37 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace outgoing requests"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """Block until enough tokens are available, then consume them"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+
+                wait = (tokens - self.tokens) / self.rate
+
+            time.sleep(wait)
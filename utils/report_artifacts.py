@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishes from several processes are not serialized
+    fcntl = None
+
+from utils.metrics import METRICS
+
+KINDS = {"pdf": "application/pdf", "json": "application/json"}
+
+
+def _publish_object(objects_dir: str, data_path: str, extension: str) -> dict:
+    """Copy a file into the content-addressed object directory (once) and describe it"""
+    with open(data_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+
+    name = f"{digest}.{extension}"
+    path = os.path.join(objects_dir, name)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(data_path, tmp_path)
+        os.replace(tmp_path, path)
+
+    return {"sha256": digest, "file": name, "size": os.path.getsize(path)}
+
+
+class ReportArtifacts:
+    """
+    Published daily reports: each day's PDF and JSON are stored once under their content hash
+    (objects/<sha256>.pdf|json) and listed in manifest.json, so downloads and previews are plain
+    file reads that never re-run the analysis or the renderer.
+    """
+
+    def __init__(self, path: str = ".cache/reports"):
+        """
+        Args:
+            path: Directory holding the manifest and the content-addressed objects
+        """
+        self.path = path
+        self.objects_dir = os.path.join(path, "objects")
+        self.manifest_path = os.path.join(path, "manifest.json")
+        self.lock = threading.Lock()
+        self._manifest = None
+        self._manifest_mtime = None
+        self._stats = {}
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize manifest updates between processes sharing the directory"""
+        with open(os.path.join(self.path, "manifest.lock"), "w") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"dates": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def manifest(self) -> dict:
+        """The manifest, re-read only when another process has published since the last call"""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return {"dates": {}}
+
+        with self.lock:
+            if mtime != self._manifest_mtime:
+                self._manifest = self._read_manifest()
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def manifest_etag(self) -> str:
+        """Validator for the manifest as currently published"""
+        self.manifest()
+        return f'"{self._manifest_mtime or 0:x}"'
+
+    def dates(self) -> list:
+        """Published dates, newest first"""
+        return sorted(self.manifest()["dates"], reverse=True)
+
+    def get(self, day: str):
+        """Manifest entry for `day` (ISO date, or "latest"), or None"""
+        dates = self.manifest()["dates"]
+        if day == "latest":
+            day = max(dates, default=None)
+        return dates.get(day) if day else None
+
+    def object_path(self, entry: dict, kind: str) -> str:
+        return os.path.join(self.objects_dir, entry[kind]["file"])
+
+    def object_stat(self, entry: dict, kind: str) -> os.stat_result:
+        """os.stat of a published object, cached since objects never change once written"""
+        name = entry[kind]["file"]
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = self._stats[name] = os.stat(os.path.join(self.objects_dir, name))
+        return stat
+
+    def publish(self, results, pdf_path: str, day: str = None, replace: bool = False) -> dict:
+        """
+        Publish a day's report unless that day is already published
+
+        Args:
+            results: Analysis results from main()
+            pdf_path: Rendered PDF report of `results`
+            day: ISO date the report is for (defaults to the analysis date)
+            replace: Publish even if the day already has a report
+
+        Returns:
+            dict: Manifest entry of the day's report
+        """
+        day = day or results["session_info"]["timestamp"][:10]
+
+        existing = self.get(day)
+        if existing and not replace:
+            return existing
+
+        json_tmp = os.path.join(self.objects_dir, f"{day}.{os.getpid()}.json.tmp")
+        with open(json_tmp, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+        try:
+            with METRICS.timer("report_publish_seconds"):
+                entry = {
+                    "date": day,
+                    "published_at": time.time(),
+                    "total_articles": len(results["articles_analysis"]),
+                    # Enough for a landing-page preview without fetching the JSON
+                    "articles": [
+                        {
+                            "title": article["article_info"]["title"],
+                            "url": article["article_info"]["url"],
+                            "tone": (article["gemini_analysis"] or {}).get("tone_of_author")
+                        }
+                        for article in results["articles_analysis"]
+                    ],
+                    "pdf": _publish_object(self.objects_dir, pdf_path, "pdf"),
+                    "json": _publish_object(self.objects_dir, json_tmp, "json")
+                }
+        finally:
+            os.remove(json_tmp)
+
+        with self._file_lock():
+            manifest = self._read_manifest()
+            if day in manifest["dates"] and not replace:
+                return manifest["dates"][day]
+            manifest["dates"][day] = entry
+            self._write_manifest(manifest)
+
+        METRICS.inc("reports_published_total")
+        print(f"📦 Published report for {day} ({entry['pdf']['sha256'][:12]})")
+        return entry
+
+    def stats(self) -> dict:
+        dates = self.dates()
+        return {"dates": len(dates), "latest": dates[0] if dates else None}
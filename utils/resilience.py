@@ -0,0 +1,203 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its endpoint's circuit is open"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the overall deadline has passed before a call could start"""
+
+
+class Deadline:
+    """Overall time budget shared by every call in a run"""
+
+    def __init__(self, seconds: float = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """Seconds left, or None when there is no deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+class CircuitBreaker:
+    """Stop calling an endpoint after repeated failures, probing again after a cool-down"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless the circuit is closed or this caller gets the single probe"""
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return
+        raise CircuitOpenError(f"Circuit for {self.name} is open after {self.failures} failures")
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.probing:
+                # A failed probe re-opens the circuit for another cool-down
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release_probe(self):
+        """End a probe that neither proved the endpoint healthy nor failed it (e.g. a 404)"""
+        with self.lock:
+            self.probing = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Return the shared circuit breaker for an endpoint, creating it on first use"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+
+def _status_code(exc: BaseException):
+    """HTTP status carried by a requests or google-genai error, if any"""
+    import requests
+
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code
+    code = getattr(exc, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient network failures and throttling/server errors are worth retrying"""
+    import requests
+
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return _status_code(exc) in RETRYABLE_STATUS
+
+
+def retry_after_seconds(exc: BaseException):
+    """Server-requested delay from a Retry-After header or a Gemini RetryInfo detail"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+
+    if value:
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+
+    # Gemini reports throttling delays as e.g. {"retryDelay": "27s"} inside error.details
+    details = getattr(exc, "details", None)
+    if isinstance(details, dict):
+        for item in details.get("error", {}).get("details", None) or []:
+            delay = item.get("retryDelay") if isinstance(item, dict) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+    return None
+
+
+def call_with_resilience(fn, *args, breaker: CircuitBreaker = None, deadline: Deadline = None,
+                         max_attempts: int = 5, initial_wait: float = 1, max_wait: float = 60, **kwargs):
+    """
+    Call `fn` with exponential backoff + jitter, honoring Retry-After, a circuit breaker
+    and an overall deadline
+
+    Args:
+        fn: Callable to invoke with *args/**kwargs
+        breaker: Circuit breaker for the endpoint being called
+        deadline: Overall time budget; retries stop once the next wait would exceed it
+        max_attempts: Maximum number of attempts
+        initial_wait: First backoff delay in seconds
+        max_wait: Upper bound for a single delay; if the server asks for a longer wait
+            (Retry-After) the call gives up instead of retrying early
+
+    Returns:
+        The return value of `fn`; the last exception is re-raised when retries run out
+    """
+    # Imported on first use to keep startup fast for entry points that never retry anything
+    from tenacity import Retrying, retry_if_exception, wait_exponential_jitter
+
+    backoff = wait_exponential_jitter(initial=initial_wait, max=max_wait, jitter=initial_wait)
+
+    def wait(retry_state):
+        delay = backoff(retry_state)
+        retry_after = retry_after_seconds(retry_state.outcome.exception())
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def stop(retry_state):
+        if retry_state.attempt_number >= max_attempts:
+            return True
+        # Only a server-requested delay can exceed max_wait; retrying sooner would just be throttled again
+        if retry_state.upcoming_sleep > max_wait:
+            return True
+        remaining = deadline.remaining() if deadline else None
+        return remaining is not None and retry_state.upcoming_sleep >= remaining
+
+    def attempt():
+        if deadline and deadline.expired():
+            raise DeadlineExceeded("Deadline exceeded before the call could start")
+        if breaker:
+            breaker.before_call()
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if breaker and is_retryable(e):
+                breaker.record_failure()
+            elif breaker:
+                breaker.release_probe()
+            raise
+
+        if breaker:
+            breaker.record_success()
+        return result
+
+    retrying = Retrying(stop=stop, wait=wait, retry=retry_if_exception(is_retryable), reraise=True)
+    return retrying(attempt)
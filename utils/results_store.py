@@ -0,0 +1,354 @@
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from utils.db import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    published_on TEXT,
+    analyzed_at REAL NOT NULL,
+    status TEXT,
+    tone TEXT,
+    central_idea TEXT,
+    takeaway TEXT,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_on);
+CREATE INDEX IF NOT EXISTS idx_articles_tone ON articles(tone, published_on);
+CREATE INDEX IF NOT EXISTS idx_articles_analyzed ON articles(analyzed_at);
+
+CREATE TABLE IF NOT EXISTS paragraph_summaries (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (article_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL UNIQUE COLLATE NOCASE
+);
+
+-- `position` and `word` keep the order and spelling the analysis gave (words.word is the first seen)
+CREATE TABLE IF NOT EXISTS vocabulary (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    meaning TEXT,
+    example_usage TEXT,
+    position INTEGER,
+    word TEXT,
+    PRIMARY KEY (article_id, word_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_vocabulary_word ON vocabulary(word_id);
+
+CREATE TABLE IF NOT EXISTS questions (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    question_type TEXT,
+    PRIMARY KEY (article_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(question_type);
+
+-- Full-text index over the article columns, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, central_idea, content, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, central_idea, content)
+    VALUES (new.id, new.title, new.central_idea, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, central_idea, content)
+    VALUES ('delete', old.id, old.title, old.central_idea, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, central_idea, content)
+    VALUES ('delete', old.id, old.title, old.central_idea, old.content);
+    INSERT INTO articles_fts(rowid, title, central_idea, content)
+    VALUES (new.id, new.title, new.central_idea, new.content);
+END;
+"""
+
+SUMMARY_COLUMNS = ("id", "url", "title", "published_on", "tone", "central_idea")
+
+
+def _text(value):
+    """`value` if it is a non-empty string, else None (analyses may be unvalidated Gemini output)"""
+    return value if isinstance(value, str) and value.strip() else None
+
+
+def _items(value, key: str = None) -> list:
+    """List items of an analysis field; with `key`, only the dicts whose `key` is text"""
+    if not isinstance(value, list):
+        return []
+    if key is None:
+        return [item for item in value if _text(item)]
+    return [item for item in value if isinstance(item, dict) and _text(item.get(key))]
+
+
+class ResultsStore:
+    """Normalized SQLite store of analyzed articles, their vocabulary and questions, with FTS5 search"""
+
+    def __init__(self, path: str = ".cache/results.sqlite"):
+        self.path = path
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Stores created before vocabulary kept its order and spelling
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(vocabulary)")}
+            for column, kind in (("position", "INTEGER"), ("word", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE vocabulary ADD COLUMN {column} {kind}")
+
+    @contextmanager
+    def _connect(self):
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            yield conn
+
+    def save_articles(self, records) -> int:
+        """
+        Insert or replace analyzed articles in one transaction
+
+        Args:
+            records: Dicts with url, title, published_on (YYYY-MM-DD), status, content and
+                analysis (an EditorialAnalysis dict, or None)
+
+        Returns:
+            int: Number of articles written
+        """
+        now = time.time()
+        written = 0
+
+        with self.lock, self._connect() as conn:
+            for record in records:
+                analysis = record.get("analysis")
+                analysis = analysis if isinstance(analysis, dict) else {}
+                if not record.get("url"):
+                    continue
+
+                tone = _text(analysis.get("tone_of_author"))
+                article_id = conn.execute(
+                    """INSERT INTO articles (url, title, published_on, analyzed_at, status, tone, central_idea,
+                                             takeaway, content)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET
+                           title = excluded.title, published_on = excluded.published_on,
+                           analyzed_at = excluded.analyzed_at, status = excluded.status, tone = excluded.tone,
+                           central_idea = excluded.central_idea, takeaway = excluded.takeaway,
+                           content = excluded.content
+                       RETURNING id""",
+                    (record["url"], record.get("title"), record.get("published_on"), now, record.get("status"),
+                     tone.lower() if tone else None, _text(analysis.get("central_idea")),
+                     _text(analysis.get("takeaway")), record.get("content"))
+                ).fetchone()[0]
+
+                # Re-analysis replaces the child rows wholesale
+                for table in ("paragraph_summaries", "vocabulary", "questions"):
+                    conn.execute(f"DELETE FROM {table} WHERE article_id = ?", (article_id,))
+
+                conn.executemany(
+                    "INSERT INTO paragraph_summaries (article_id, position, summary) VALUES (?, ?, ?)",
+                    [(article_id, position, summary)
+                     for position, summary in enumerate(_items(analysis.get("paragraph_wise_summary")))]
+                )
+
+                vocabulary = _items(analysis.get("vocabulary_builder"), "word")
+                conn.executemany("INSERT OR IGNORE INTO words (word) VALUES (?)",
+                                 [(entry["word"].strip(),) for entry in vocabulary])
+                conn.executemany(
+                    """INSERT OR REPLACE INTO vocabulary (article_id, word_id, meaning, example_usage, position, word)
+                       SELECT ?, id, ?, ?, ?, ? FROM words WHERE word = ?""",
+                    [(article_id, _text(entry.get("meaning")), _text(entry.get("example_usage")), position,
+                      entry["word"].strip(), entry["word"].strip())
+                     for position, entry in enumerate(vocabulary)]
+                )
+
+                conn.executemany(
+                    "INSERT INTO questions (article_id, position, question, question_type) VALUES (?, ?, ?, ?)",
+                    [(article_id, position, question["question"], _text(question.get("question_type")))
+                     for position, question in enumerate(_items(analysis.get("critical_thinking_questions"),
+                                                                 "question"))]
+                )
+                written += 1
+
+        return written
+
+    def save_results(self, results, published_on: str = None) -> int:
+        """Store the output of main.main()/analyze_url(); the date defaults to the session's"""
+        if not results:
+            return 0
+
+        published_on = published_on or results["session_info"]["timestamp"][:10]
+        return self.save_articles(
+            {
+                "url": entry["article_info"]["url"],
+                "title": entry["article_info"]["title"],
+                "published_on": published_on,
+                "status": entry["article_info"]["status"],
+                "content": entry["original_content"],
+                "analysis": entry["gemini_analysis"]
+            }
+            for entry in results["articles_analysis"]
+            if entry["gemini_analysis"]
+        )
+
+    def articles(self, tone: str = None, start: str = None, end: str = None, limit: int = 100) -> list:
+        """
+        Article summaries filtered by tone and publication date range (inclusive, YYYY-MM-DD),
+        newest first
+        """
+        clauses, params = [], []
+        if tone:
+            clauses.append("tone = ?")
+            params.append(tone.lower())
+        if start:
+            clauses.append("published_on >= ?")
+            params.append(start)
+        if end:
+            clauses.append("published_on <= ?")
+            params.append(end)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM articles {where} "
+                "ORDER BY published_on DESC, id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [dict(zip(SUMMARY_COLUMNS, row)) for row in rows]
+
+    def frequent_words(self, min_count: int = 3, limit: int = 100) -> list:
+        """Vocabulary words seen in at least `min_count` articles, most frequent first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT w.word, COUNT(*) AS seen FROM vocabulary v JOIN words w ON w.id = v.word_id
+                   GROUP BY v.word_id HAVING seen >= ? ORDER BY seen DESC, w.word LIMIT ?""",
+                (min_count, limit)
+            ).fetchall()
+        return [{"word": word, "count": count} for word, count in rows]
+
+    def word_usages(self, word: str) -> list:
+        """Every article a vocabulary word was picked from, with the meaning given there"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT a.url, a.title, a.published_on, v.meaning, v.example_usage
+                   FROM words w JOIN vocabulary v ON v.word_id = w.id JOIN articles a ON a.id = v.article_id
+                   WHERE w.word = ? ORDER BY a.published_on DESC""",
+                (word.strip(),)
+            ).fetchall()
+        return [dict(zip(("url", "title", "published_on", "meaning", "example_usage"), row)) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Full-text search (FTS5 query syntax) over titles, central ideas and content, best matches first"""
+        with self._connect() as conn:
+            try:
+                rows = self._search(conn, query, limit)
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (e.g. a stray quote); search for the words themselves instead
+                terms = " ".join('"' + word.replace('"', '') + '"' for word in query.split() if word.replace('"', ''))
+                rows = self._search(conn, terms, limit) if terms else []
+        return [dict(zip(("id", "url", "title", "published_on", "tone", "snippet"), row)) for row in rows]
+
+    @staticmethod
+    def _search(conn, query: str, limit: int) -> list:
+        return conn.execute(
+            """SELECT a.id, a.url, a.title, a.published_on, a.tone,
+                      snippet(articles_fts, 2, '[', ']', '…', 12)
+               FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+               WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts, 10.0, 5.0, 1.0) LIMIT ?""",
+            (query, limit)
+        ).fetchall()
+
+    def versions(self, since: float = 0) -> list:
+        """(id, analyzed_at) of articles saved after `since`, oldest first"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, analyzed_at FROM articles WHERE analyzed_at > ? ORDER BY analyzed_at, id", (since,)
+            ).fetchall()
+
+    def iter_documents(self, ids, batch_size: int = 500):
+        """Yield articles (id, analyzed_at, title, content, vocabulary words) for `ids`, in batches"""
+        ids = list(ids)
+        with self._connect() as conn:
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                cursor = conn.execute(
+                    f"""SELECT a.id, a.analyzed_at, a.title, a.content,
+                               (SELECT group_concat(w.word, ' ') FROM vocabulary v JOIN words w ON w.id = v.word_id
+                                WHERE v.article_id = a.id)
+                        FROM articles a WHERE a.id IN ({', '.join('?' * len(batch))})""",
+                    batch
+                )
+                for row in cursor:
+                    yield dict(zip(("id", "analyzed_at", "title", "content", "vocabulary"), row))
+
+    def summaries(self, ids) -> dict:
+        """Article summaries keyed by id"""
+        ids = list(ids)
+        if not ids:
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM articles WHERE id IN ({', '.join('?' * len(ids))})",
+                ids
+            ).fetchall()
+        return {row[0]: dict(zip(SUMMARY_COLUMNS, row)) for row in rows}
+
+    def get_analysis(self, url: str):
+        """Rebuild the stored EditorialAnalysis dict for `url`, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, tone, central_idea, takeaway FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+            if not row or row[2] is None:
+                return None
+
+            article_id = row[0]
+            summaries = conn.execute(
+                "SELECT summary FROM paragraph_summaries WHERE article_id = ? ORDER BY position", (article_id,)
+            ).fetchall()
+            vocabulary = conn.execute(
+                """SELECT coalesce(v.word, w.word), v.meaning, v.example_usage
+                   FROM vocabulary v JOIN words w ON w.id = v.word_id
+                   WHERE v.article_id = ? ORDER BY v.position, v.word_id""",
+                (article_id,)
+            ).fetchall()
+            questions = conn.execute(
+                "SELECT question, question_type FROM questions WHERE article_id = ? ORDER BY position",
+                (article_id,)
+            ).fetchall()
+
+        return {
+            "central_idea": row[2],
+            "tone_of_author": row[1],
+            "paragraph_wise_summary": [summary for (summary,) in summaries],
+            "vocabulary_builder": [
+                {"word": word, "meaning": meaning, "example_usage": example}
+                for word, meaning, example in vocabulary
+            ],
+            "critical_thinking_questions": [
+                {"question": question, "question_type": question_type} for question, question_type in questions
+            ],
+            "takeaway": row[3]
+        }
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("articles", "words", "vocabulary", "questions")
+            }
+        counts["bytes"] = os.path.getsize(self.path)
+        return counts
@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import threading
+
+from utils.db import connect
+
+
+class ScrapeIndex:
+    """Persistent record of fetched URLs: HTTP validators plus what was extracted from them"""
+
+    FIELDS = ("etag", "last_modified", "title", "content", "links")
+
+    def __init__(self, path: str = ".cache/scrape_index.sqlite"):
+        self.path = path
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    title TEXT,
+                    content TEXT,
+                    links TEXT,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return connect(self.path)
+
+    def get(self, url: str):
+        """Return the stored entry for `url` as a dict, or None"""
+        with self.lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, title, content, links, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        entry = dict(zip(self.FIELDS + ("fetched_at",), row))
+        entry["links"] = json.loads(entry["links"]) if entry["links"] else None
+        return entry
+
+    def update(self, url: str, **fields):
+        """Insert or update the given fields for `url`"""
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown index fields: {', '.join(sorted(unknown))}")
+
+        if "links" in fields and fields["links"] is not None:
+            fields["links"] = json.dumps(fields["links"])
+
+        with self.lock, self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO pages (url, fetched_at) VALUES (?, ?)", (url, time.time()))
+            if fields:
+                assignments = ", ".join(f"{name} = ?" for name in fields)
+                conn.execute(
+                    f"UPDATE pages SET {assignments}, fetched_at = ? WHERE url = ?",
+                    (*fields.values(), time.time(), url)
+                )
+
+    def has_article(self, url: str) -> bool:
+        """True if the article's title and content have already been extracted"""
+        entry = self.get(url)
+        return bool(entry and entry["content"] is not None and entry["title"] is not None)
@@ -0,0 +1,401 @@
+import os
+import re
+import json
+import math
+import mmap
+import time
+import heapq
+import array
+import struct
+import threading
+from itertools import accumulate
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes from several processes are not serialized
+    fcntl = None
+
+from utils.metrics import METRICS
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his in is it its of on or that the their "
+    "there they this to was were which will with would not no".split()
+)
+
+# Term frequencies are weighted per field, so matches in titles and vocabulary outrank body text
+TITLE_WEIGHT = 3
+VOCABULARY_WEIGHT = 3
+CONTENT_WEIGHT = 1
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rows saved by another process shortly before our last sync may commit after it
+SYNC_OVERLAP_SECONDS = 60
+# search() checks the store for new articles at most this often
+SYNC_INTERVAL_SECONDS = 1.0
+
+# Segment file: header, doc ids/lengths/analysis times, lexicon sorted by term, term bytes, postings
+MAGIC = b"HIDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIQ")         # magic, version, docs, terms, term bytes
+LEXICON = struct.Struct("<IHQII")         # term offset, term length, postings offset, postings length, df
+DELTA = -1                                # owner of documents that are only in memory so far
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens without stopwords"""
+    return [token for token in TOKEN.findall((text or "").lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+def encode_varints(values, out: bytearray):
+    """Append unsigned ints as LEB128 varints (7 bits per byte, high bit = more bytes follow)"""
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def decode_varints(data) -> list:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def write_segment(path: str, docs: dict, postings: dict):
+    """
+    Write an immutable segment file atomically
+
+    Args:
+        path: Destination file
+        docs: {doc_id: (length, analyzed_at)}
+        postings: {term: {doc_id: weighted term frequency}}
+    """
+    doc_ids = sorted(docs)
+    terms = sorted(postings, key=lambda term: term.encode())
+
+    lexicon = bytearray()
+    term_bytes = bytearray()
+    blob = bytearray()
+    for term in terms:
+        encoded = term.encode()
+        start = len(blob)
+        # Doc ids are stored as gaps from the previous id, interleaved with the frequency
+        previous = 0
+        for doc_id in sorted(postings[term]):
+            encode_varints((doc_id - previous, postings[term][doc_id]), blob)
+            previous = doc_id
+        lexicon += LEXICON.pack(len(term_bytes), len(encoded), start, len(blob) - start, len(postings[term]))
+        term_bytes += encoded
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(doc_ids), len(terms), len(term_bytes)))
+        f.write(array.array("I", doc_ids).tobytes())
+        f.write(array.array("I", (docs[doc_id][0] for doc_id in doc_ids)).tobytes())
+        f.write(array.array("d", (docs[doc_id][1] for doc_id in doc_ids)).tobytes())
+        f.write(lexicon)
+        f.write(term_bytes)
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    """Read-only, memory-mapped view of a segment file; postings are decoded on demand"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.num_docs, self.num_terms, term_bytes = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} search segment")
+
+        offset = HEADER.size
+        self.docs_offset = offset
+        offset += self.num_docs * 16
+        self.lexicon_offset = offset
+        self.terms_offset = offset + self.num_terms * LEXICON.size
+        self.postings_offset = self.terms_offset + term_bytes
+
+    def docs(self):
+        """Yield (doc_id, length, analyzed_at) for every document in the segment"""
+        n = self.num_docs
+        ids = array.array("I", self.mm[self.docs_offset:self.docs_offset + 4 * n])
+        lengths = array.array("I", self.mm[self.docs_offset + 4 * n:self.docs_offset + 8 * n])
+        analyzed = array.array("d", self.mm[self.docs_offset + 8 * n:self.docs_offset + 16 * n])
+        return zip(ids, lengths, analyzed)
+
+    def _entry(self, position: int):
+        return LEXICON.unpack_from(self.mm, self.lexicon_offset + position * LEXICON.size)
+
+    def _term(self, entry) -> bytes:
+        return self.mm[self.terms_offset + entry[0]:self.terms_offset + entry[0] + entry[1]]
+
+    def _decode(self, entry) -> list:
+        start = self.postings_offset + entry[2]
+        data = self.mm[start:start + entry[3]]
+        # Dense postings (the expensive ones) are mostly single-byte gaps and frequencies
+        values = list(data) if max(data, default=0) < 0x80 else decode_varints(data)
+        return list(zip(accumulate(values[0::2]), values[1::2]))
+
+    def postings(self, term: str) -> list:
+        """[(doc_id, frequency)] for `term`, found by binary search over the mapped lexicon"""
+        key = term.encode()
+        low, high = 0, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._entry(middle)
+            current = self._term(entry)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return self._decode(entry)
+        return []
+
+    def iter_postings(self):
+        """Yield (term, postings) for every term, in lexicon order"""
+        for position in range(self.num_terms):
+            entry = self._entry(position)
+            yield self._term(entry).decode(), self._decode(entry)
+
+    def close(self):
+        self.mm.close()
+
+
+class SearchIndex:
+    """
+    BM25 full-text index over article titles, content and vocabulary words.
+
+    Documents come from the ResultsStore (doc ids are article ids): sync() picks up articles
+    saved since the last sync, so whatever main() stores becomes searchable on the next query.
+    New documents are held in memory and flushed as small immutable segments, which are
+    merged into one once there are more than `max_segments` of them.
+    """
+
+    def __init__(self, store=None, path: str = ".cache/search", flush_docs: int = 256, max_segments: int = 8):
+        """
+        Args:
+            store: ResultsStore the documents are read from
+            path: Directory holding the manifest and segment files
+            flush_docs: In-memory documents that trigger writing a new segment
+            max_segments: Segment count above which all segments are merged into one
+        """
+        if store is None:
+            from utils.results_store import ResultsStore
+            store = ResultsStore()
+
+        self.store = store
+        self.path = path
+        self.flush_docs = flush_docs
+        self.max_segments = max_segments
+        self.manifest_path = os.path.join(path, "manifest.json")
+        self.lock = threading.RLock()
+        self.segments = []
+        self.last_sync = 0
+
+        os.makedirs(path, exist_ok=True)
+        with self._file_lock():
+            self._open()
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"segments": [], "watermark": 0}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, segments: list, watermark: float):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": segments, "watermark": watermark}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize segment writes between processes sharing the index directory"""
+        with open(os.path.join(self.path, "index.lock"), "w") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _open(self):
+        """(Re)load the segments listed in the manifest and drop in-memory documents"""
+        for segment in self.segments:
+            segment.close()
+
+        manifest = self._read_manifest()
+        self.segments = [Segment(os.path.join(self.path, name)) for name in manifest["segments"]]
+        self.synced = manifest["watermark"]
+
+        # doc_id -> (length, analyzed_at, owner); a newer segment supersedes older copies of a doc
+        self.docs = {}
+        for position, segment in enumerate(self.segments):
+            for doc_id, length, analyzed_at in segment.docs():
+                self.docs[doc_id] = (length, analyzed_at, position)
+        self.total_length = sum(length for length, _, _ in self.docs.values())
+
+        self.delta_docs = {}                      # doc_id -> Counter of weighted term frequencies
+        self.delta_postings = defaultdict(dict)   # term -> {doc_id: frequency}
+
+    def _add(self, doc_id: int, analyzed_at: float, title: str, content: str, vocabulary: str):
+        counts = Counter()
+        for tokens, weight in ((tokenize(title), TITLE_WEIGHT), (tokenize(content), CONTENT_WEIGHT),
+                               (tokenize(vocabulary), VOCABULARY_WEIGHT)):
+            for token in tokens:
+                counts[token] += weight
+
+        for term in self.delta_docs.get(doc_id, ()):
+            del self.delta_postings[term][doc_id]
+        for term, frequency in counts.items():
+            self.delta_postings[term][doc_id] = frequency
+        self.delta_docs[doc_id] = counts
+
+        previous = self.docs.get(doc_id)
+        length = sum(counts.values())
+        self.total_length += length - (previous[0] if previous else 0)
+        self.docs[doc_id] = (length, analyzed_at, DELTA)
+
+    def sync(self, flush: bool = False) -> int:
+        """
+        Index articles saved to the store since the last sync
+
+        Args:
+            flush: Write in-memory documents to a segment even below `flush_docs`
+
+        Returns:
+            int: Number of documents (re)indexed
+        """
+        with self.lock:
+            added = self._catch_up()
+            self.last_sync = time.monotonic()
+            if self.delta_docs and (flush or len(self.delta_docs) >= self.flush_docs):
+                self._flush()
+            return added
+
+    def _catch_up(self) -> int:
+        stale = [
+            doc_id for doc_id, analyzed_at in self.store.versions(since=self.synced - SYNC_OVERLAP_SECONDS)
+            if doc_id not in self.docs or self.docs[doc_id][1] < analyzed_at
+        ]
+        for document in self.store.iter_documents(stale):
+            self._add(document["id"], document["analyzed_at"], document["title"], document["content"],
+                      document["vocabulary"])
+            self.synced = max(self.synced, document["analyzed_at"])
+        return len(stale)
+
+    def _flush(self):
+        with self._file_lock(), METRICS.timer("search_index_flush_seconds"):
+            if self._read_manifest()["segments"] != [segment.name for segment in self.segments]:
+                # Another process flushed first: start from its segments and re-read what they lack
+                self._open()
+                self._catch_up()
+                if not self.delta_docs:
+                    return
+
+            name = f"segment-{time.time_ns()}.idx"
+            write_segment(
+                os.path.join(self.path, name),
+                {doc_id: self.docs[doc_id][:2] for doc_id in self.delta_docs},
+                self.delta_postings
+            )
+            names = [segment.name for segment in self.segments] + [name]
+            self._write_manifest(names, self.synced)
+            self._open()
+
+            if len(self.segments) > self.max_segments:
+                self._merge()
+
+    def _merge(self):
+        """Rewrite all segments as one, dropping superseded copies of documents"""
+        postings = defaultdict(dict)
+        for position, segment in enumerate(self.segments):
+            for term, entries in segment.iter_postings():
+                for doc_id, frequency in entries:
+                    if self.docs[doc_id][2] == position:
+                        postings[term][doc_id] = frequency
+
+        old_names = [segment.name for segment in self.segments]
+        name = f"segment-{time.time_ns()}.idx"
+        write_segment(os.path.join(self.path, name),
+                      {doc_id: entry[:2] for doc_id, entry in self.docs.items()}, postings)
+        self._write_manifest([name], self.synced)
+        self._open()
+
+        for old_name in old_names:
+            os.remove(os.path.join(self.path, old_name))
+
+    def rebuild(self) -> int:
+        """Drop every segment and re-index the whole store"""
+        with self.lock, self._file_lock():
+            old_names = [segment.name for segment in self.segments]
+            self._write_manifest([], 0)
+            self._open()
+            for old_name in old_names:
+                os.remove(os.path.join(self.path, old_name))
+        return self.sync(flush=True)
+
+    def _postings(self, term: str) -> list:
+        postings = [
+            (doc_id, frequency)
+            for position, segment in enumerate(self.segments)
+            for doc_id, frequency in segment.postings(term)
+            if self.docs[doc_id][2] == position
+        ]
+        postings.extend(self.delta_postings.get(term, {}).items())
+        return postings
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        BM25-ranked articles matching any of the query's words
+
+        Returns:
+            list: Article summaries (see ResultsStore.summaries) with a "score", best first
+        """
+        if time.monotonic() - self.last_sync >= SYNC_INTERVAL_SECONDS:
+            self.sync()
+
+        with self.lock, METRICS.timer("search_query_seconds"):
+            if not self.docs:
+                return []
+
+            num_docs = len(self.docs)
+            average_length = self.total_length / num_docs or 1
+            scores = defaultdict(float)
+
+            for term in set(tokenize(query)):
+                postings = self._postings(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.docs[doc_id][0] / average_length)
+                    scores[doc_id] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+        summaries = self.store.summaries(doc_id for doc_id, _ in top)
+        return [{**summaries[doc_id], "score": round(score, 4)} for doc_id, score in top if doc_id in summaries]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "documents": len(self.docs),
+                "segments": len(self.segments),
+                "unflushed": len(self.delta_docs),
+                "bytes": sum(os.path.getsize(segment.path) for segment in self.segments)
+            }
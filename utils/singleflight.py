@@ -0,0 +1,130 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key onto one in-flight job and cache its result"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 256):
+        """
+        Args:
+            ttl_seconds: How long a successful result is served before the job runs again
+            max_entries: Cached results kept at most; the least recently used are evicted first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.inflight = {}
+        self.results = OrderedDict()
+        # Per in-flight job: whether it emits events, the events so far and the subscribers' queues
+        self.streams = {}
+
+    def _cached(self, key):
+        cached = self.results.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.results.move_to_end(key)
+            return cached[1]
+        return None
+
+    def _start(self, key, emits: bool, fn, *args, **kwargs):
+        task = asyncio.ensure_future(asyncio.to_thread(fn, *args, **kwargs))
+        self.inflight[key] = task
+        self.streams[key] = {"emits": emits, "events": [], "queues": []}
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def run(self, key, fn, *args, **kwargs):
+        """
+        Return the cached result for `key`, join the in-flight job for it, or start
+        `fn(*args, **kwargs)` in a worker thread. None results are not cached.
+        """
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        task = self.inflight.get(key)
+        if task is None:
+            task = self._start(key, False, fn, *args, **kwargs)
+
+        # A disconnecting client must not cancel the job other callers are waiting on
+        return await asyncio.shield(task)
+
+    def subscribe(self, key, fn, replay):
+        """
+        Follow the job for `key` as a stream of events, starting `fn(emit)` if none is in flight
+
+        Args:
+            fn: Job run in a worker thread as fn(emit); it may call emit(event) from that thread
+            replay: replay(result, emit) re-emits a finished result, for cached results and for
+                jobs started by run(), which emit nothing
+
+        Returns:
+            tuple: (queue, future) - the queue yields every event of the job, including those emitted
+            before subscribing, then None when it is over; the future holds the job's result
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        cached = self._cached(key)
+        if cached is not None:
+            replay(cached, queue.put_nowait)
+            queue.put_nowait(None)
+            future = loop.create_future()
+            future.set_result(cached)
+            return queue, future
+
+        task = self.inflight.get(key)
+        if task is None:
+            def emit(event):
+                loop.call_soon_threadsafe(self._publish, key, event)
+
+            task = self._start(key, True, fn, emit)
+
+        stream = self.streams[key]
+        for event in stream["events"]:
+            queue.put_nowait(event)
+        stream["queues"].append((queue, replay))
+        return queue, task
+
+    def unsubscribe(self, key, queue):
+        """Stop delivering events to a subscriber that went away; the job keeps running"""
+        stream = self.streams.get(key)
+        if stream:
+            stream["queues"] = [(q, replay) for q, replay in stream["queues"] if q is not queue]
+
+    def _publish(self, key, event):
+        stream = self.streams.get(key)
+        if stream is None:
+            return
+        stream["events"].append(event)
+        for queue, _ in stream["queues"]:
+            queue.put_nowait(event)
+
+    def _finish(self, key, task):
+        self.inflight.pop(key, None)
+        stream = self.streams.pop(key, None)
+        failed = task.cancelled() or task.exception() is not None
+        result = None if failed else task.result()
+
+        if stream:
+            for queue, replay in stream["queues"]:
+                if result is not None and not stream["emits"]:
+                    replay(result, queue.put_nowait)
+                queue.put_nowait(None)
+
+        if result is None:
+            return
+
+        now = time.monotonic()
+        self.results[key] = (now + self.ttl_seconds, result)
+        self.results.move_to_end(key)
+
+        # Drop expired results, then the least recently used ones beyond the cap
+        for stale in [k for k, (expires_at, _) in self.results.items() if expires_at <= now]:
+            del self.results[stale]
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a cached result so the next call runs the job again"""
+        self.results.pop(key, None)
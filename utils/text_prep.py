@@ -0,0 +1,78 @@
+import re
+
+# Words, numbers and individual punctuation marks; Gemini's tokenizer averages ~1.3 tokens per English word
+TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+TOKENS_PER_WORD = 1.3
+
+# Paragraphs that are page furniture rather than editorial text
+BOILERPLATE = re.compile(
+    r"^(published|updated)\s*[-–:]"
+    r"|^(also read|read more|read comments|subscribe|sign up|click here|follow us|download the .*app)\b"
+    r"|^(copyright|©)"
+    r"|^the views expressed\b"
+    r"|^comments have to be in english\b"
+    r"|^(this article is closed for comments|we have migrated to a new commenting platform)",
+    re.IGNORECASE
+)
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"'‘“])")
+
+
+def estimate_tokens(text: str) -> int:
+    """Local approximation of the Gemini token count of `text` (no API call)"""
+    if not text:
+        return 0
+    pieces = TOKEN_PIECE.findall(text)
+    words = sum(1 for piece in pieces if piece[0].isalnum() or piece[0] == "_")
+    return int(words * TOKENS_PER_WORD) + (len(pieces) - words)
+
+
+def split_paragraphs(text: str) -> list:
+    """Non-empty, whitespace-normalized paragraphs (get_article_content joins them with newlines)"""
+    return [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop bylines, comment-policy notices, 'read more' teasers, shouty labels and repeated paragraphs"""
+    paragraphs = []
+    seen = set()
+
+    for paragraph in split_paragraphs(text):
+        if BOILERPLATE.search(paragraph):
+            continue
+        # Section labels like "EDITORIAL" or "MORE IN OPINION"
+        if paragraph.isupper() and len(paragraph.split()) <= 5:
+            continue
+        if paragraph in seen:
+            continue
+        seen.add(paragraph)
+        paragraphs.append(paragraph)
+
+    return "\n".join(paragraphs)
+
+
+def chunk_paragraphs(text: str, max_tokens: int) -> list:
+    """
+    Group paragraphs into chunks of at most `max_tokens` estimated tokens, keeping
+    paragraphs whole unless a single one is too long (those are split at sentence ends)
+    """
+    pieces = []
+    for paragraph in split_paragraphs(text):
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(SENTENCE_END.split(paragraph))
+
+    chunks = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks